@@ -1,6 +1,7 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
+#     "orjson>=3.9",
 #     "pydantic>=2.0",
 #     "python-dotenv>=1.0",
 # ]
@@ -22,24 +23,21 @@ Usage:
 
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
 from typing import Any
 
+import orjson
 from dotenv import load_dotenv
-from pydantic import TypeAdapter
 
-# Import directly from config module (avoids heavy package deps like pandas)
-# We import the module file directly to bypass package __init__.py
-import importlib.util
+# Make the in-repo package importable under `uv run` (isolated script env).
+# The package __init__ loads its API lazily, so this pulls in pydantic only.
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-_config_path = Path(__file__).parent.parent / "src/gapless_deribit_clickhouse/config/connections.py"
-_spec = importlib.util.spec_from_file_location("connections", _config_path)
-_connections = importlib.util.module_from_spec(_spec)
-sys.modules["connections"] = _connections
-_spec.loader.exec_module(_connections)
-ClickHouseConnection = _connections.ClickHouseConnection
+from gapless_deribit_clickhouse.config.connections import ClickHouseConnection  # noqa: E402
+
+# Human-readable output with trailing newline (same layout as json.dumps(indent=2))
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
 
 
 def generate_dbeaver_config() -> dict[str, Any]:
@@ -86,8 +84,8 @@ def generate_json_schema() -> dict[str, Any]:
 
     This schema provides IDE IntelliSense when editing data-sources.json.
     """
-    adapter = TypeAdapter(ClickHouseConnection)
-    return adapter.json_schema()
+    # model_json_schema reuses the model's compiled core schema (no TypeAdapter build)
+    return ClickHouseConnection.model_json_schema()
 
 
 def main() -> None:
@@ -99,13 +97,13 @@ def main() -> None:
     # Generate data-sources.json
     config = generate_dbeaver_config()
     config_path = dbeaver_dir / "data-sources.json"
-    config_path.write_text(json.dumps(config, indent=2) + "\n")
+    config_path.write_bytes(orjson.dumps(config, option=_JSON_OPTIONS))
     print(f"Generated: {config_path}")
 
     # Generate JSON Schema
     schema = generate_json_schema()
     schema_path = dbeaver_dir / "data-sources.schema.json"
-    schema_path.write_text(json.dumps(schema, indent=2) + "\n")
+    schema_path.write_bytes(orjson.dumps(schema, option=_JSON_OPTIONS))
     print(f"Generated: {schema_path}")
 
     # Summary
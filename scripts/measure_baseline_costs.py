@@ -4,6 +4,7 @@
 # dependencies = [
 #     "httpx>=0.27",
 #     "boto3>=1.35",
+#     "orjson>=3.9",
 # ]
 # ///
 """
@@ -15,6 +16,7 @@ after running cost experiments.
 Usage:
     uv run scripts/measure_baseline_costs.py
     uv run scripts/measure_baseline_costs.py --days 14
+    uv run scripts/measure_baseline_costs.py --no-cache  # Force fresh API calls
 
 ADR: 2025-12-08-clickhouse-data-pipeline-architecture
 """
@@ -22,12 +24,47 @@ ADR: 2025-12-08-clickhouse-data-pipeline-architecture
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import sys
-from datetime import datetime
+import time
+from collections.abc import Callable
+from datetime import date, datetime
 from pathlib import Path
 
+import orjson
 
+# Billing API response cache (AWS Cost Explorer bills $0.01 per request)
+COST_CACHE_DIR = Path("tmp/cost_cache")
+COST_CACHE_TTL_SECONDS = 6 * 3600
+
+
+def cached_cost(func: Callable[[int], dict | None]) -> Callable[..., dict | None]:
+    """
+    Cache billing results on disk for COST_CACHE_TTL_SECONDS.
+
+    Keyed by (function, days, today) so a new day always triggers a fresh query.
+    Failed lookups (None) are never cached.
+    """
+
+    @functools.wraps(func)
+    def wrapper(days: int, use_cache: bool = True) -> dict | None:
+        cache_path = COST_CACHE_DIR / f"{func.__name__}_{days}d_{date.today().isoformat()}.json"
+
+        if use_cache and cache_path.exists():
+            age = time.time() - cache_path.stat().st_mtime
+            if age < COST_CACHE_TTL_SECONDS:
+                return orjson.loads(cache_path.read_bytes())
+
+        result = func(days)
+        if result is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(orjson.dumps(result))
+        return result
+
+    return wrapper
+
+
+@cached_cost
 def measure_clickhouse_costs(days: int) -> dict | None:
     """Query ClickHouse Cloud billing API."""
     try:
@@ -53,6 +90,7 @@ def measure_clickhouse_costs(days: int) -> dict | None:
         return None
 
 
+@cached_cost
 def measure_aws_costs(days: int) -> dict | None:
     """Query AWS Cost Explorer API."""
     try:
@@ -87,15 +125,20 @@ def main() -> int:
         default=Path("tmp/baseline_costs.json"),
         help="Output file (default: tmp/baseline_costs.json)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Bypass the {COST_CACHE_TTL_SECONDS // 3600}h billing response cache",
+    )
     args = parser.parse_args()
 
     print(f"Measuring {args.days}-day baseline costs...")
 
     baseline = {
-        "measured_at": datetime.now().isoformat(),
+        "measured_at": datetime.now(),  # orjson serializes datetime natively
         "period_days": args.days,
-        "clickhouse": measure_clickhouse_costs(args.days),
-        "aws": measure_aws_costs(args.days),
+        "clickhouse": measure_clickhouse_costs(args.days, use_cache=not args.no_cache),
+        "aws": measure_aws_costs(args.days, use_cache=not args.no_cache),
     }
 
     # Print summary
@@ -123,7 +166,7 @@ def main() -> int:
 
     # Save to file
     args.output.parent.mkdir(parents=True, exist_ok=True)
-    args.output.write_text(json.dumps(baseline, indent=2))
+    args.output.write_bytes(orjson.dumps(baseline, option=orjson.OPT_INDENT_2))
     print(f"\nBaseline saved to: {args.output}")
 
     return 0
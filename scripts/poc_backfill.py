@@ -22,39 +22,106 @@ ADR: 2025-12-08-clickhouse-data-pipeline-architecture
 from __future__ import annotations
 
 import argparse
+import asyncio
 import sys
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
+import pandas as pd
 
-def run_backfill(start_date: str, end_date: str, dry_run: bool = False) -> dict:
+# Concurrent day-chunks (kept low: history.deribit.com rate-limits per IP)
+DEFAULT_CONCURRENCY = 4
+
+# Rows sampled for deep memory estimate (deep=True walks every object cell)
+MEMORY_SAMPLE_ROWS = 10_000
+
+
+def estimate_bytes(df: pd.DataFrame) -> int:
+    """Estimate deep memory usage by extrapolating from a fixed-size sample."""
+    if df.empty:
+        return 0
+    sample = df.sample(min(len(df), MEMORY_SAMPLE_ROWS), random_state=0)
+    return int(sample.memory_usage(index=False, deep=True).sum() * len(df) / len(sample))
+
+
+def split_days(start_date: str, end_date: str) -> list[tuple[str, str]]:
+    """Split [start_date, end_date) into consecutive one-day ranges."""
+    day = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    ranges = []
+    while day < end:
+        next_day = day + timedelta(days=1)
+        ranges.append((day.isoformat(), next_day.isoformat()))
+        day = next_day
+    return ranges
+
+
+def _measure_day(day_start: str, day_end: str, dry_run: bool) -> tuple[int, int]:
+    """Stream one day of trades batch by batch; return (rows, estimated bytes)."""
+    from gapless_deribit_clickhouse import collect_trades_iter
+
+    rows = 0
+    bytes_raw = 0
+    for batch in collect_trades_iter(
+        currency="BTC",
+        start_date=day_start,
+        end_date=day_end,
+        insert_to_db=not dry_run,
+    ):
+        rows += len(batch)
+        bytes_raw += estimate_bytes(batch)
+    return rows, bytes_raw
+
+
+async def _collect_days(
+    day_ranges: list[tuple[str, str]],
+    dry_run: bool,
+    concurrency: int,
+) -> list[tuple[int, int]]:
+    """Collect day ranges concurrently (each day has its own checkpoint/dedup tokens)."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def collect_day(day_start: str, day_end: str) -> tuple[int, int]:
+        async with semaphore:
+            return await asyncio.to_thread(_measure_day, day_start, day_end, dry_run)
+
+    return await asyncio.gather(*(collect_day(s, e) for s, e in day_ranges))
+
+
+def run_backfill(
+    start_date: str,
+    end_date: str,
+    dry_run: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> dict:
     """
     Run backfill for specified date range.
 
+    The range is split into day chunks collected concurrently. Each day is
+    streamed in insert-sized batches, so only counters are kept in memory.
+
     Returns:
         Dict with row count, duration, and data size metrics.
     """
-    from gapless_deribit_clickhouse import collect_trades
-
     print(f"Backfilling: {start_date} to {end_date}")
 
     if dry_run:
         print("DRY RUN - collecting without insertion")
 
+    day_ranges = split_days(start_date, end_date)
+    print(f"Collecting {len(day_ranges)} day(s), {concurrency} concurrently")
+
     start_time = datetime.now()
 
-    df = collect_trades(
-        currency="BTC",
-        start_date=start_date,
-        end_date=end_date,
-        insert_to_db=not dry_run,
-    )
+    day_metrics = asyncio.run(_collect_days(day_ranges, dry_run, concurrency))
+    rows = sum(day_rows for day_rows, _ in day_metrics)
+    bytes_raw = sum(day_bytes for _, day_bytes in day_metrics)
 
     duration = (datetime.now() - start_time).total_seconds()
 
     return {
-        "rows": len(df),
+        "rows": rows,
         "duration_seconds": duration,
-        "bytes_raw": df.memory_usage(deep=True).sum(),
+        "bytes_raw": bytes_raw,
         "start_date": start_date,
         "end_date": end_date,
         "inserted": not dry_run,
@@ -84,6 +151,12 @@ def main() -> int:
         action="store_true",
         help="Collect data without inserting to database",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Days collected in parallel (default: {DEFAULT_CONCURRENCY})",
+    )
     args = parser.parse_args()
 
     # Resolve date range
@@ -107,7 +180,9 @@ def main() -> int:
     print()
 
     try:
-        metrics = run_backfill(start_date, end_date, dry_run=args.dry_run)
+        metrics = run_backfill(
+            start_date, end_date, dry_run=args.dry_run, concurrency=args.concurrency
+        )
     except Exception as e:
         print(f"Backfill failed: {e}", file=sys.stderr)
         return 1
@@ -25,12 +25,15 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field, ValidationError, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, model_validator
+
+# Ports that require TLS (ClickHouse Cloud HTTPS / native secure)
+_SECURE_PORTS = frozenset({"443", "8443"})
+_HTTPS_URL_PREFIXES = ("https://", "jdbc:clickhouse:https:")
 
 
 class DBeaverConnectionConfig(BaseModel):
@@ -47,12 +50,26 @@ class DBeaverConnectionConfig(BaseModel):
     user: str = "default"
     password: str = ""
 
+    @property
+    def https(self) -> bool:
+        """Whether the JDBC URL uses HTTPS."""
+        return self.url.startswith(_HTTPS_URL_PREFIXES)
+
+    @property
+    def secure(self) -> bool:
+        """Whether the port is a TLS port."""
+        return self.port in _SECURE_PORTS
+
     @model_validator(mode="after")
     def validate_url_protocol_consistency(self) -> DBeaverConnectionConfig:
         """Ensure JDBC URL protocol matches port expectations."""
-        # TODO: Implement validation logic
-        # Consider: port 443/8443 should use https, port 8123/9000 should use http
-        # This is where YOUR implementation goes
+        https = self.https
+        if https ^ self.secure:
+            if https:
+                raise ValueError(
+                    f"HTTPS URL but non-secure port {self.port} (expected 443 or 8443)"
+                )
+            raise ValueError(f"Secure port {self.port} but HTTP URL (expected HTTPS)")
         return self
 
 
@@ -76,6 +93,10 @@ class DBeaverDataSources(BaseModel):
     )
 
 
+# Module-level adapter: schema is built once and reused across validate_config calls
+_DS_ADAPTER: TypeAdapter[DBeaverDataSources] = TypeAdapter(DBeaverDataSources)
+
+
 def validate_config(config_path: Path) -> tuple[bool, list[str]]:
     """Validate DBeaver config file.
 
@@ -88,44 +109,24 @@ def validate_config(config_path: Path) -> tuple[bool, list[str]]:
     if not config_path.exists():
         return False, [f"Config file not found: {config_path}"]
 
-    # Parse JSON
+    # Parse + validate in one pass: pydantic-core decodes the JSON bytes
+    # straight into the models, with no intermediate Python dict
     try:
-        config_data = json.loads(config_path.read_text())
-    except json.JSONDecodeError as e:
-        return False, [f"Invalid JSON: {e}"]
-
-    # Validate with Pydantic
-    try:
-        datasources = DBeaverDataSources.model_validate(config_data)
+        datasources = _DS_ADAPTER.validate_json(config_path.read_bytes())
     except ValidationError as e:
         for error in e.errors():
+            if error["type"] == "json_invalid":
+                return False, [error["msg"]]  # Already prefixed "Invalid JSON: "
             loc = ".".join(str(x) for x in error["loc"])
             errors.append(f"{loc}: {error['msg']}")
         return False, errors
 
-    # Additional validations
+    # Additional validations (URL/port consistency is checked by the model validator)
     if not datasources.connections:
         errors.append("No connections defined")
         return False, errors
 
-    for conn_id, conn in datasources.connections.items():
-        # Validate JDBC URL consistency
-        url = conn.configuration.url
-        port = conn.configuration.port
-
-        is_https = "https" in url
-        is_secure_port = port in ("443", "8443")
-
-        if is_https and not is_secure_port:
-            errors.append(
-                f"{conn_id}: HTTPS URL but non-secure port {port} (expected 443 or 8443)"
-            )
-        if is_secure_port and not is_https:
-            errors.append(
-                f"{conn_id}: Secure port {port} but HTTP URL (expected HTTPS)"
-            )
-
-    return len(errors) == 0, errors
+    return True, errors
 
 
 def main() -> int:
@@ -15,8 +15,11 @@ Quick Start:
 ADR: 2025-12-05-trades-only-architecture-pivot
 """
 
-from gapless_deribit_clickhouse.api import fetch_trades
-from gapless_deribit_clickhouse.collectors import collect_trades
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from gapless_deribit_clickhouse.exceptions import (
     APIError,
     ConfigurationError,
@@ -28,8 +31,39 @@ from gapless_deribit_clickhouse.exceptions import (
     RateLimitError,
     SchemaError,
 )
-from gapless_deribit_clickhouse.probe import describe, get_capabilities, get_data_sources
-from gapless_deribit_clickhouse.utils import parse_instrument
+
+if TYPE_CHECKING:
+    from gapless_deribit_clickhouse.api import fetch_trades, iter_trades
+    from gapless_deribit_clickhouse.collectors import collect_trades, collect_trades_iter
+    from gapless_deribit_clickhouse.probe import describe, get_capabilities, get_data_sources
+    from gapless_deribit_clickhouse.utils import parse_instrument
+
+# PEP 562 lazy attributes: api/collectors pull in pandas, httpx and tenacity,
+# so they are only imported on first access (exceptions stay eager - they are light)
+_LAZY_IMPORTS: dict[str, str] = {
+    "fetch_trades": "gapless_deribit_clickhouse.api",
+    "iter_trades": "gapless_deribit_clickhouse.api",
+    "collect_trades": "gapless_deribit_clickhouse.collectors",
+    "collect_trades_iter": "gapless_deribit_clickhouse.collectors",
+    "parse_instrument": "gapless_deribit_clickhouse.utils",
+    "describe": "gapless_deribit_clickhouse.probe",
+    "get_capabilities": "gapless_deribit_clickhouse.probe",
+    "get_data_sources": "gapless_deribit_clickhouse.probe",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value  # Cache so __getattr__ is not hit again
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 # ADR: 2025-12-05-trades-only-architecture-pivot - dynamic version with fallback
 try:
@@ -44,8 +78,10 @@ __all__ = [
     "__version__",
     # Public API
     "fetch_trades",
+    "iter_trades",
     # Collectors
     "collect_trades",
+    "collect_trades_iter",
     # Utilities
     "parse_instrument",
     # Probe (AI discoverability)
@@ -20,16 +20,107 @@ ADR: 2025-12-10-schema-optimization (FINAL clause for deduplication)
 
 from __future__ import annotations
 
-import pandas as pd
+import re
+from collections.abc import Iterator, Sequence
+from datetime import UTC, date, datetime, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from gapless_deribit_clickhouse.clickhouse.connection import get_client
 from gapless_deribit_clickhouse.exceptions import QueryError
 
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# Source table for fetch_trades
+TRADES_TABLE = "deribit.options_trades"
+
+# Selectable columns (schema/clickhouse/options_trades.yaml). Identifiers cannot be
+# bound as parameters, so fetch_trades(columns=...) is checked against this set.
+TRADES_COLUMNS = frozenset(
+    {
+        "trade_id",
+        "instrument_name",
+        "timestamp",
+        "price",
+        "amount",
+        "direction",
+        "iv",
+        "index_price",
+        "mark_price",
+        "underlying",
+        "expiry",
+        "strike",
+        "option_type",
+    }
+)
+
+# Allowed filter values (enums in options_trades.yaml): anything else cannot match,
+# so it is rejected locally instead of costing a scan that returns nothing
+VALID_UNDERLYINGS = frozenset({"BTC", "ETH"})
+VALID_OPTION_TYPES = frozenset({"C", "P"})
+
+# LowCardinality columns returned as pandas categoricals (x-pandas dtype "category");
+# fixed categories avoid per-call inference and keep chunk concatenation categorical
+_TRADES_CATEGORIES: dict[str, tuple[str, ...]] = {
+    "direction": ("buy", "sell"),
+    "underlying": tuple(sorted(VALID_UNDERLYINGS)),
+    "option_type": tuple(sorted(VALID_OPTION_TYPES)),
+}
+
+# Date-only inputs ("2024-01-31") take the no-parse fast path in _normalize_timestamp
+_DATE_ONLY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Epoch-millisecond conversion constants
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_EPOCH_ORDINAL = _EPOCH.date().toordinal()
+_MS_PER_DAY = 86_400_000
+_ONE_MS = timedelta(milliseconds=1)
+
+# Adaptive time-range chunking (fetch_trades chunk_target_rows / stream)
+DEFAULT_CHUNK_TARGET_ROWS = 1_000_000
+_INITIAL_CHUNK_FRACTION = 16  # First chunk covers 1/16 of the requested range
+_MIN_CHUNK_MS = 3_600_000  # 1 hour
+_MAX_CHUNK_MS = 30 * _MS_PER_DAY
+
+# limit-only fetches first try a recent window; the ORDER BY ... LIMIT then sorts
+# only that window instead of the whole table
+DEFAULT_LOOKBACK_DAYS = 7
+
+# ADR: 2025-12-10-schema-optimization - scope FINAL merges to single partitions
+FINAL_QUERY_SETTINGS: dict[str, int] = {"do_not_merge_across_partitions_select_final": 1}
+
+# WHERE conditions per fetch_trades filter, in clause order (values bound as parameters)
+# ADR: 2025-12-10-schema-optimization - time bounds also restate the partition key
+# (toYYYYMM(timestamp)) so partitions outside the range are pruned from the key
+# alone. Both sides use the server timezone, like the DateTime64(3) column.
+_FILTER_CONDITIONS: tuple[tuple[str, str], ...] = (
+    ("underlying", "underlying = {underlying:String}"),
+    (
+        "start",
+        "timestamp >= fromUnixTimestamp64Milli({start:Int64}) AND "
+        "toYYYYMM(timestamp) >= toYYYYMM(fromUnixTimestamp64Milli({start:Int64}))",
+    ),
+    (
+        "end",
+        "timestamp < fromUnixTimestamp64Milli({end:Int64}) AND "
+        "toYYYYMM(timestamp) <= toYYYYMM(fromUnixTimestamp64Milli({end:Int64} - 1))",
+    ),
+    ("option_type", "option_type = {option_type:String}"),
+    ("expiry", "expiry = {expiry:Date}"),
+    ("strike", "strike = {strike:Float64}"),
+)
+
 
 def _validate_fetch_params(
     start: str | None,
     end: str | None,
     limit: int | None,
+    underlying: str | None = None,
+    option_type: str | None = None,
+    expiry: str | None = None,
+    strike: float | None = None,
 ) -> None:
     """
     Validate fetch parameters before database query.
@@ -63,38 +154,124 @@ def _validate_fetch_params(
     if limit is not None and limit < 0:
         raise ValueError(f"limit must be non-negative, got {limit}")
 
+    # Rule 5: Filters outside the column's domain can never match
+    if underlying is not None and underlying not in VALID_UNDERLYINGS:
+        raise ValueError(
+            f"underlying must be one of {sorted(VALID_UNDERLYINGS)}, got {underlying!r}"
+        )
+    if option_type is not None and option_type not in VALID_OPTION_TYPES:
+        raise ValueError(
+            f"option_type must be one of {sorted(VALID_OPTION_TYPES)}, got {option_type!r}"
+        )
+    if expiry is not None and not _DATE_ONLY_RE.match(expiry):
+        raise ValueError(f"expiry must be YYYY-MM-DD, got {expiry!r}")
+    if strike is not None and strike < 0:
+        raise ValueError(f"strike must be non-negative, got {strike}")
+
 
-def _normalize_timestamp(ts_str: str, is_end: bool = False) -> str:
+def _normalize_timestamp(ts_str: str, is_end: bool = False) -> int:
     """
-    Normalize timestamp string for inclusive date range queries.
+    Normalize timestamp string to epoch milliseconds for range queries.
 
     Expands date-only strings to include the full day:
     - Start dates: midnight of that day
     - End dates: midnight of the NEXT day (for exclusive < comparison)
 
     Args:
-        ts_str: Timestamp string (various formats)
+        ts_str: Timestamp string (ISO 8601 fast path; other formats via pandas)
         is_end: If True, expand date-only to next day start for < comparison
 
+    Naive inputs are interpreted as UTC; timezone-aware inputs are converted.
+    The integer is bound as Int64 and wrapped in fromUnixTimestamp64Milli(), so
+    ClickHouse never parses a datetime literal.
+
     Returns:
-        Formatted timestamp string with millisecond precision
+        Milliseconds since the Unix epoch (UTC)
+
+    Raises:
+        ValueError: If ts_str cannot be parsed as a date/timestamp
     """
-    ts = pd.to_datetime(ts_str)
+    # Fast path: plain YYYY-MM-DD (the common case) is pure date arithmetic
+    if _DATE_ONLY_RE.match(ts_str):
+        try:
+            day = date.fromisoformat(ts_str)
+        except ValueError as e:
+            raise ValueError(f"Invalid timestamp: {ts_str!r}") from e
+        if is_end:
+            day += timedelta(days=1)
+        return (day.toordinal() - _EPOCH_ORDINAL) * _MS_PER_DAY
+
+    try:
+        ts = datetime.fromisoformat(ts_str)
+        is_date_only = "T" not in ts_str and ":" not in ts_str  # e.g. "20240131"
+    except ValueError:
+        ts, is_date_only = _parse_timestamp_fallback(ts_str)
+
+    if is_date_only and is_end:
+        ts = ts + timedelta(days=1)
+
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return (ts - _EPOCH) // _ONE_MS
+
+
+def _parse_timestamp_fallback(ts_str: str) -> tuple[datetime, bool]:
+    """Parse non-ISO timestamp strings with pandas; return (timestamp, is_date_only)."""
+    import pandas as pd
+
+    try:
+        ts = pd.to_datetime(ts_str).to_pydatetime()
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid timestamp: {ts_str!r}") from e
 
-    # Detect date-only input
     is_date_only = (
         ts.hour == 0
         and ts.minute == 0
         and ts.second == 0
         and ts.microsecond == 0
-        and "T" not in str(ts_str)
-        and ":" not in str(ts_str)
+        and "T" not in ts_str
+        and ":" not in ts_str
     )
+    return ts, is_date_only
+
+
+# Single-line SELECT template; clauses below are filled in by _build_fetch_query
+_FETCH_SQL = "SELECT {columns} FROM {table}{final} WHERE {where}{order_limit}"
+_FINAL_CLAUSE = " FINAL"
+# Sorting only matters for picking the latest N rows; unbounded range reads
+# skip the global sort (the sorting key is not timestamp-first, so read-in-order
+# cannot replace it) and callers sort client-side if they need to.
+# The row count is bound too, so every limit value shares one query text.
+_ORDER_LIMIT_CLAUSE = " ORDER BY timestamp DESC LIMIT {limit:UInt64}"
+
+
+@lru_cache(maxsize=64)
+def _build_fetch_query(
+    table: str,
+    filters: frozenset[str],
+    use_final: bool,
+    limited: bool,
+    columns: tuple[str, ...] | None = None,
+) -> str:
+    """
+    Build (and memoize) the fetch SQL for a given table and filter shape.
 
-    if is_date_only and is_end:
-        ts = ts + pd.Timedelta(days=1)
-
-    return ts.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    Only the set of active filters (and the projected columns) shapes the SQL;
+    values, including the limit, are bound as server-side parameters, so
+    recurring call patterns reuse the same string. ``columns`` must already
+    be validated.
+    """
+    conditions = [cond for name, cond in _FILTER_CONDITIONS if name in filters]
+
+    return _FETCH_SQL.format(
+        columns=", ".join(columns) if columns else "*",
+        table=table,
+        # ADR: 2025-12-10-schema-optimization
+        # FINAL ensures deduplication with ReplacingMergeTree (trade_id uniqueness)
+        final=_FINAL_CLAUSE if use_final else "",
+        where=" AND ".join(conditions) if conditions else "1=1",
+        order_limit=_ORDER_LIMIT_CLAUSE if limited else "",
+    )
 
 
 def fetch_trades(
@@ -106,7 +283,12 @@ def fetch_trades(
     strike: float | None = None,
     limit: int | None = None,
     use_final: bool = True,
-) -> pd.DataFrame:
+    as_arrow: bool = False,
+    chunk_target_rows: int | None = None,
+    stream: bool = False,
+    columns: Sequence[str] | None = None,
+    lookback_days: int | None = DEFAULT_LOOKBACK_DAYS,
+) -> pd.DataFrame | pa.Table | Iterator[pd.DataFrame | pa.Table]:
     """
     Fetch historical options trades from ClickHouse.
 
@@ -119,64 +301,306 @@ def fetch_trades(
         option_type: Filter by option type ("C" or "P")
         expiry: Filter by expiration date (YYYY-MM-DD)
         strike: Filter by strike price
-        limit: Maximum rows to return
+        limit: Maximum rows to return (the most recent, ordered by timestamp
+               descending). Without a limit, rows come back in storage order;
+               sort client-side (e.g. df.sort_values("timestamp")) if needed.
         use_final: If True (default), use FINAL to deduplicate results.
                   Set to False for faster queries when duplicates are acceptable.
+        as_arrow: If True, return a pyarrow Table decoded from ClickHouse's Arrow
+                  output format (columnar, no pandas conversion). Requires the
+                  optional pyarrow dependency (pip install 'gapless-deribit-clickhouse[arrow]').
+        chunk_target_rows: If set, split [start, end) into time chunks sized to
+                  return about this many rows each (adapted from the previous
+                  chunk's row count) and query them newest-first. Caps server-side
+                  memory for multi-year pulls. Requires start and end, no limit.
+        stream: If True, return an iterator of per-chunk results instead of one
+                concatenated result (chunk_target_rows defaults to
+                DEFAULT_CHUNK_TARGET_ROWS). Requires start and end, no limit.
+        columns: Columns to select (default: all). Projecting a subset cuts
+                 bytes read, transferred, and decoded. Must be names from
+                 TRADES_COLUMNS.
+        lookback_days: With a limit but no start/end, first query only the last
+                 lookback_days days and fall back to the full table if that
+                 window holds fewer than limit rows. The result is identical;
+                 the server just sorts far fewer rows. None disables.
 
     Returns:
-        DataFrame with trade data
+        DataFrame with trade data (pyarrow Table if as_arrow=True), or an
+        iterator of them if stream=True
 
     Raises:
         ValueError: If parameters are invalid
+        ImportError: If as_arrow=True and pyarrow is not installed
         QueryError: If query fails
     """
     # ADR: 2025-12-05-trades-only-architecture-pivot - fail-fast validation
-    _validate_fetch_params(start, end, limit)
+    _validate_fetch_params(start, end, limit, underlying, option_type, expiry, strike)
 
-    conditions: list[str] = []
-    params: dict[str, str | float | int] = {}
+    selected = _validate_columns(columns)
 
-    if underlying:
-        conditions.append("underlying = {underlying:String}")
-        params["underlying"] = underlying
+    if as_arrow:
+        _require_pyarrow("as_arrow=True")
 
-    if start:
-        conditions.append("timestamp >= {start:DateTime64(3)}")
-        params["start"] = _normalize_timestamp(start, is_end=False)
+    params = _trade_filter_params(underlying, start, end, option_type, expiry, strike)
 
-    if end:
-        conditions.append("timestamp < {end:DateTime64(3)}")
-        params["end"] = _normalize_timestamp(end, is_end=True)
+    if stream or chunk_target_rows is not None:
+        if start is None or end is None or limit is not None:
+            raise ValueError("chunk_target_rows/stream require start and end, and no limit")
+        target_rows = (
+            DEFAULT_CHUNK_TARGET_ROWS if chunk_target_rows is None else chunk_target_rows
+        )
+        if target_rows <= 0:
+            raise ValueError(f"chunk_target_rows must be positive, got {target_rows}")
+        chunks = _iter_time_chunks(
+            TRADES_TABLE, params, use_final, as_arrow, target_rows, selected
+        )
+        if stream:
+            return chunks
+        return _concat_chunks(list(chunks), as_arrow)
+
+    if limit and start is None and end is None and lookback_days:
+        # The newest `limit` rows of the window are the newest overall whenever
+        # the window holds at least `limit` rows
+        window_start = datetime.now(UTC) - timedelta(days=lookback_days)
+        recent = _fetch(
+            TRADES_TABLE,
+            {**params, "start": (window_start - _EPOCH) // _ONE_MS},
+            use_final,
+            limit,
+            as_arrow,
+            selected,
+        )
+        if len(recent) >= limit:
+            return recent
 
-    if option_type:
-        conditions.append("option_type = {option_type:String}")
-        params["option_type"] = option_type
+    return _fetch(TRADES_TABLE, params, use_final, limit, as_arrow, selected)
 
-    if expiry:
-        conditions.append("expiry = {expiry:Date}")
-        params["expiry"] = expiry
 
-    if strike:
-        conditions.append("strike = {strike:Float64}")
-        params["strike"] = strike
+def iter_trades(
+    underlying: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    option_type: str | None = None,
+    expiry: str | None = None,
+    strike: float | None = None,
+    limit: int | None = None,
+    use_final: bool = True,
+    columns: Sequence[str] | None = None,
+    as_pandas: bool = False,
+) -> Iterator[pa.RecordBatch | pd.DataFrame]:
+    """
+    Stream historical options trades as Arrow record batches.
 
-    where_clause = " AND ".join(conditions) if conditions else "1=1"
-    limit_clause = f"LIMIT {limit}" if limit else ""
-    # ADR: 2025-12-10-schema-optimization
-    # FINAL ensures deduplication with ReplacingMergeTree (trade_id uniqueness)
-    final_clause = "FINAL" if use_final else ""
+    Same filters as fetch_trades, but rows are decoded one ClickHouse block at
+    a time from the ArrowStream output format, so peak memory is one batch
+    rather than the whole result. Requires pyarrow.
+
+    The HTTP response stays open while iterating: drain the iterator or call
+    its close() to return the connection to the pool promptly.
+
+    Args:
+        underlying, start, end, option_type, expiry, strike, limit, use_final,
+        columns: As for fetch_trades
+        as_pandas: If True, yield each batch converted to a DataFrame
+
+    Yields:
+        pyarrow RecordBatch per block (DataFrame if as_pandas=True)
+
+    Raises:
+        ValueError: If parameters are invalid
+        ImportError: If pyarrow is not installed
+        QueryError: If query fails
+    """
+    # Validation runs eagerly (not on first next()) so errors surface at the call
+    _validate_fetch_params(start, end, limit, underlying, option_type, expiry, strike)
+    selected = _validate_columns(columns)
+    _require_pyarrow("iter_trades")
+
+    params = _trade_filter_params(underlying, start, end, option_type, expiry, strike)
+    return _stream(TRADES_TABLE, params, use_final, limit, selected, as_pandas)
+
+
+def _stream(
+    table: str,
+    params: dict[str, str | float | int],
+    use_final: bool,
+    limit: int | None,
+    columns: tuple[str, ...] | None,
+    as_pandas: bool,
+) -> Iterator[pa.RecordBatch | pd.DataFrame]:
+    """Generator behind iter_trades; closing it closes the HTTP stream."""
+    query = _build_fetch_query(table, frozenset(params), use_final, bool(limit), columns)
+    if limit:
+        params = {**params, "limit": limit}
+    settings = FINAL_QUERY_SETTINGS if use_final else {}
+
+    try:
+        with get_client().query_arrow_stream(
+            query, parameters=params, settings=settings
+        ) as batches:
+            for batch in batches:
+                yield _apply_trades_dtypes(batch.to_pandas()) if as_pandas else batch
+    except Exception as e:
+        raise QueryError(f"Failed to stream from {table}: {e}") from e
+
+
+@lru_cache(maxsize=1)
+def _trades_dtypes() -> dict[str, pd.CategoricalDtype]:
+    """Predeclared categorical dtypes for _TRADES_CATEGORIES (built once)."""
+    import pandas as pd
+
+    return {name: pd.CategoricalDtype(values) for name, values in _TRADES_CATEGORIES.items()}
 
-    query = f"""
-        SELECT *
-        FROM deribit.options_trades {final_clause}
-        WHERE {where_clause}
-        ORDER BY timestamp DESC
-        {limit_clause}
+
+def _apply_trades_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the low-cardinality string columns present in df in one astype call."""
+    dtypes = {name: dtype for name, dtype in _trades_dtypes().items() if name in df.columns}
+    return df.astype(dtypes) if dtypes else df
+
+
+def _require_pyarrow(feature: str) -> None:
+    """Raise an install hint if the optional pyarrow dependency is missing."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            f"pyarrow required for {feature}. "
+            "Install with: pip install 'gapless-deribit-clickhouse[arrow]'"
+        ) from e
+
+
+def _trade_filter_params(
+    underlying: str | None,
+    start: str | None,
+    end: str | None,
+    option_type: str | None,
+    expiry: str | None,
+    strike: float | None,
+) -> dict[str, str | float | int]:
+    """Map fetch filters to bound query parameters, dropping unset ones."""
+    filters: dict[str, str | float | int | None] = {
+        "underlying": underlying,
+        "start": _normalize_timestamp(start, is_end=False) if start else None,
+        "end": _normalize_timestamp(end, is_end=True) if end else None,
+        "option_type": option_type,
+        "expiry": expiry,
+        "strike": strike,
+    }
+    # Not truthiness: start=0 (1970-01-01) and strike=0.0 are real bounds
+    return {name: value for name, value in filters.items() if value is not None}
+
+
+def _validate_columns(columns: Sequence[str] | None) -> tuple[str, ...] | None:
+    """
+    Check a column projection against TRADES_COLUMNS.
+
+    Raises:
+        ValueError: If columns is empty, a bare string, or names unknown columns
     """
+    if columns is None:
+        return None
+    if isinstance(columns, str):
+        raise ValueError(f"columns must be a sequence of names, got string {columns!r}")
+
+    selected = tuple(dict.fromkeys(columns))  # De-duplicate, keep caller order
+    if not selected:
+        raise ValueError("columns cannot be empty; use None to select all columns")
+
+    unknown = [name for name in selected if name not in TRADES_COLUMNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown column(s) {unknown}. Valid columns: {sorted(TRADES_COLUMNS)}"
+        )
+    return selected
+
+
+def _iter_time_chunks(
+    table: str,
+    params: dict[str, str | float | int],
+    use_final: bool,
+    as_arrow: bool,
+    target_rows: int,
+    columns: tuple[str, ...] | None = None,
+) -> Iterator[pd.DataFrame | pa.Table]:
+    """
+    Fetch [params["start"], params["end"]) as consecutive time chunks, newest first.
+
+    The first chunk spans 1/16 of the range; each following chunk is rescaled by
+    target_rows / rows_returned, clamped to [1 hour, 30 days]. Every chunk binds
+    the same filter shape, so they all reuse one memoized SQL string.
+
+    Chunks are unsorted internally (no limit, so no ORDER BY), but walking the
+    range backwards yields them newest-first. FINAL stays correct per chunk:
+    duplicates share a timestamp.
+    """
+    range_start = int(params["start"])
+    chunk_end = int(params["end"])
+    chunk_ms = (chunk_end - range_start) // _INITIAL_CHUNK_FRACTION
+    chunk_ms = min(max(chunk_ms, _MIN_CHUNK_MS), _MAX_CHUNK_MS)
+
+    while chunk_end > range_start:
+        chunk_start = max(chunk_end - chunk_ms, range_start)
+        chunk = _fetch(
+            table,
+            {**params, "start": chunk_start, "end": chunk_end},
+            use_final,
+            None,
+            as_arrow,
+            columns,
+        )
+        yield chunk
+
+        chunk_ms = int(chunk_ms * target_rows / max(len(chunk), 1))
+        chunk_ms = min(max(chunk_ms, _MIN_CHUNK_MS), _MAX_CHUNK_MS)
+        chunk_end = chunk_start
+
+
+def _concat_chunks(
+    chunks: list[pd.DataFrame | pa.Table], as_arrow: bool
+) -> pd.DataFrame | pa.Table:
+    """Concatenate per-chunk results into a single DataFrame or Table."""
+    if len(chunks) == 1:
+        return chunks[0]
+    if as_arrow:
+        import pyarrow as pa
+
+        return pa.concat_tables(chunks)
+
+    import pandas as pd
+
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _fetch(
+    table: str,
+    params: dict[str, str | float | int],
+    use_final: bool,
+    limit: int | None,
+    as_arrow: bool,
+    columns: tuple[str, ...] | None = None,
+) -> pd.DataFrame | pa.Table:
+    """
+    Run a filtered SELECT against a ReplacingMergeTree table.
+
+    Shared by the public fetch_* functions; ``params`` keys select which
+    _FILTER_CONDITIONS apply, values are bound server-side.
+    """
+    query = _build_fetch_query(table, frozenset(params), use_final, bool(limit), columns)
+    if limit:
+        params = {**params, "limit": limit}
+    # ADR: 2025-12-10-schema-optimization
+    # The partition key (toYYYYMM(timestamp)) is derived from the sorting key, so a
+    # duplicate can never span partitions. FINAL can therefore merge each partition
+    # independently, after the WHERE clause has pruned partitions outside the range.
+    # argMax(..., version) is not an option: the engine has no version column.
+    settings = FINAL_QUERY_SETTINGS if use_final else {}
 
     client = get_client()
 
     try:
-        return client.query_df(query, parameters=params)
+        if as_arrow:
+            return client.query_arrow(query, parameters=params, settings=settings)
+        df = client.query_df(query, parameters=params, settings=settings)
     except Exception as e:
-        raise QueryError(f"Failed to fetch trades: {e}") from e
+        raise QueryError(f"Failed to fetch from {table}: {e}") from e
+    return _apply_trades_dtypes(df)
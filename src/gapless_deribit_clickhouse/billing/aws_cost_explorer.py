@@ -11,10 +11,36 @@ ADR: 2025-12-08-clickhouse-data-pipeline-architecture
 
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
+# Pipeline-related services (server-side filter keeps responses small)
+PIPELINE_SERVICES = [
+    "AWS Lambda",
+    "Amazon EC2 Spot",
+    "Amazon Elastic Compute Cloud - Compute",
+    "AWS Data Transfer",
+]
+COST_METRIC = "BlendedCost"
+
+# AWSCost field per pipeline service (exact names: the request filters on them)
+_SERVICE_COST_FIELD = {
+    "AWS Lambda": "lambda_cost",
+    "Amazon EC2 Spot": "ec2_spot_cost",
+    "Amazon Elastic Compute Cloud - Compute": "ec2_spot_cost",
+    "AWS Data Transfer": "data_transfer_cost",
+}
+
+# Windows this long are queried at MONTHLY granularity (fewer ResultsByTime rows)
+MONTHLY_GRANULARITY_MIN_DAYS = 28
+
+# Cost Explorer bills $0.01 per request, including each paginated page
+MAX_COST_EXPLORER_PAGES = 5
+
 
 @dataclass
 class AWSCost:
@@ -77,57 +103,61 @@ class AWSCostExplorer:
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
 
-        response = self.client.get_cost_and_usage(
-            TimePeriod={
+        granularity = "MONTHLY" if days >= MONTHLY_GRANULARITY_MIN_DAYS else "DAILY"
+        response = self._query_costs(start_date, end_date, granularity)
+
+        return self._parse_cost_results(response["ResultsByTime"], start_date, end_date)
+
+    def _query_costs(self, start_date: date, end_date: date, granularity: str) -> dict[str, Any]:
+        """
+        Query Cost Explorer for pipeline services, following pagination.
+
+        Requests a single metric grouped by service and stops after
+        MAX_COST_EXPLORER_PAGES pages to bound per-call cost, logging a
+        warning when more pages remain (the costs are then undercounted).
+        """
+        request: dict[str, Any] = {
+            "TimePeriod": {
                 "Start": start_date.isoformat(),
                 "End": end_date.isoformat(),
             },
-            Granularity="DAILY",
-            Metrics=["BlendedCost"],
-            GroupBy=[{"Type": "DIMENSION", "Key": "SERVICE"}],
-            Filter={
-                "Dimensions": {
-                    "Key": "SERVICE",
-                    "Values": [
-                        "AWS Lambda",
-                        "Amazon EC2 Spot",
-                        "Amazon Elastic Compute Cloud - Compute",
-                        "AWS Data Transfer",
-                    ],
-                }
-            },
-        )
+            "Granularity": granularity,
+            "Metrics": [COST_METRIC],
+            "GroupBy": [{"Type": "DIMENSION", "Key": "SERVICE"}],
+            "Filter": {"Dimensions": {"Key": "SERVICE", "Values": PIPELINE_SERVICES}},
+        }
+
+        results_by_time: list[dict[str, Any]] = []
+        for _ in range(MAX_COST_EXPLORER_PAGES):
+            response = self.client.get_cost_and_usage(**request)
+            results_by_time.extend(response.get("ResultsByTime", []))
+            next_token = response.get("NextPageToken")
+            if not next_token:
+                break
+            request["NextPageToken"] = next_token
+        else:
+            logger.warning(
+                f"Cost Explorer results truncated after {MAX_COST_EXPLORER_PAGES} pages "
+                f"({start_date} to {end_date}); costs are undercounted"
+            )
 
-        return self._parse_cost_response(response, start_date, end_date)
+        return {"ResultsByTime": results_by_time}
 
-    def _parse_cost_response(
-        self, response: dict[str, Any], start_date: date, end_date: date
+    def _parse_cost_results(
+        self, results: list[dict[str, Any]], start_date: date, end_date: date
     ) -> AWSCost:
-        """Parse Cost Explorer response into AWSCost dataclass."""
-        # Aggregate costs across all days
-        lambda_cost = 0.0
-        ec2_spot_cost = 0.0
-        data_transfer_cost = 0.0
+        """Aggregate ResultsByTime entries into a single AWSCost dataclass."""
+        totals = dict.fromkeys(_SERVICE_COST_FIELD.values(), 0.0)
 
-        for result in response.get("ResultsByTime", []):
+        for result in results:
             for group in result.get("Groups", []):
-                service = group["Keys"][0]
-                amount = float(group["Metrics"]["BlendedCost"]["Amount"])
-
-                if service == "AWS Lambda":
-                    lambda_cost += amount
-                elif "Spot" in service or "EC2" in service:
-                    ec2_spot_cost += amount
-                elif "Transfer" in service:
-                    data_transfer_cost += amount
-
-        total_cost = lambda_cost + ec2_spot_cost + data_transfer_cost
+                field = _SERVICE_COST_FIELD.get(group["Keys"][0])
+                if field is not None:
+                    totals[field] += float(group["Metrics"][COST_METRIC]["Amount"])
 
         return AWSCost(
-            lambda_cost=lambda_cost,
-            ec2_spot_cost=ec2_spot_cost,
-            data_transfer_cost=data_transfer_cost,
-            total_cost=total_cost,
+            **totals,
+            total_cost=sum(totals.values()),
             period_start=start_date,
             period_end=end_date,
         )
@@ -142,34 +172,24 @@ class AWSCostExplorer:
         Returns:
             List of AWSCost, one per day
         """
-        results = []
+        if days <= 0:
+            return []
+
         end_date = date.today()
+        start_date = end_date - timedelta(days=days - 1)
 
-        for i in range(days):
-            day = end_date - timedelta(days=i)
-            next_day = day + timedelta(days=1)
-
-            response = self.client.get_cost_and_usage(
-                TimePeriod={
-                    "Start": day.isoformat(),
-                    "End": next_day.isoformat(),
-                },
-                Granularity="DAILY",
-                Metrics=["BlendedCost"],
-                GroupBy=[{"Type": "DIMENSION", "Key": "SERVICE"}],
-                Filter={
-                    "Dimensions": {
-                        "Key": "SERVICE",
-                        "Values": [
-                            "AWS Lambda",
-                            "Amazon EC2 Spot",
-                            "Amazon Elastic Compute Cloud - Compute",
-                            "AWS Data Transfer",
-                        ],
-                    }
-                },
-            )
+        # One DAILY request returns a ResultsByTime bucket per day (in order),
+        # instead of one billed round trip per day. A day's groups can be split
+        # across pages, so entries are merged by period start before parsing
+        response = self._query_costs(start_date, end_date + timedelta(days=1), "DAILY")
 
-            results.append(self._parse_cost_response(response, day, day))
+        results_by_day: dict[str, list[dict[str, Any]]] = {}
+        for result in response["ResultsByTime"]:
+            results_by_day.setdefault(result["TimePeriod"]["Start"], []).append(result)
+
+        results = []
+        for day_start, day_results in results_by_day.items():
+            day = date.fromisoformat(day_start)
+            results.append(self._parse_cost_results(day_results, day, day))
 
-        return list(reversed(results))  # Chronological order
+        return results
@@ -10,7 +10,9 @@ ADR: 2025-12-08-clickhouse-data-pipeline-architecture
 
 from __future__ import annotations
 
+import importlib.util
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import Any
@@ -25,6 +27,39 @@ ENV_ORGANIZATION_ID = "CLICKHOUSE_CLOUD_ORG_ID"
 # API base URL
 API_BASE_URL = "https://api.clickhouse.cloud/v1"
 
+# HTTP client configuration
+REQUEST_TIMEOUT_SECONDS = 30.0
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+MAX_KEEPALIVE_CONNECTIONS = 10
+
+# Per-day usageCost requests in flight at once (stays within the keep-alive pool)
+MAX_CONCURRENT_REQUESTS = 8
+
+# Shared keep-alive client: repeated calls (e.g. daily breakdowns) reuse one
+# TLS connection instead of handshaking per request
+_shared_http_client: httpx.Client | None = None
+
+
+def _get_shared_http_client() -> httpx.Client:
+    """
+    Return the process-wide keep-alive httpx client, creating it on first use.
+
+    Negotiates HTTP/2 when the optional h2 package is installed
+    (pip install 'gapless-deribit-clickhouse[http2]'), so concurrent daily
+    breakdown requests multiplex over a single TLS connection.
+    """
+    global _shared_http_client
+    if _shared_http_client is None:
+        _shared_http_client = httpx.Client(
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+    return _shared_http_client
+
 
 @dataclass
 class UsageCost:
@@ -58,6 +93,7 @@ class ClickHouseCloudBilling:
         api_key_id: str | None = None,
         api_key_secret: str | None = None,
         organization_id: str | None = None,
+        http_client: httpx.Client | None = None,
     ) -> None:
         """
         Initialize billing client.
@@ -66,6 +102,8 @@ class ClickHouseCloudBilling:
             api_key_id: ClickHouse Cloud API key ID. Defaults to env var.
             api_key_secret: ClickHouse Cloud API key secret. Defaults to env var.
             organization_id: ClickHouse Cloud organization ID. Defaults to env var.
+            http_client: httpx client to send requests with. Defaults to a shared
+                         module-level keep-alive client.
 
         Raises:
             ValueError: If credentials are not provided or found in environment.
@@ -87,6 +125,21 @@ class ClickHouseCloudBilling:
                 "Get credentials from ClickHouse Cloud console: Settings → API Keys"
             )
 
+        self._http = http_client or _get_shared_http_client()
+        # Built once instead of per request
+        self._auth = httpx.BasicAuth(self.api_key_id, self.api_key_secret)
+        self._usage_url = f"{API_BASE_URL}/organizations/{self.organization_id}/usageCost"
+
+    def _get_usage_data(self, from_date: date, to_date: date) -> dict[str, Any]:
+        """GET usageCost for [from_date, to_date] over the shared connection."""
+        params = {
+            "from_date": from_date.isoformat(),
+            "to_date": to_date.isoformat(),
+        }
+        response = self._http.get(self._usage_url, params=params, auth=self._auth)
+        response.raise_for_status()
+        return response.json()
+
     def get_usage_cost(self, days: int = 7) -> UsageCost:
         """
         Get usage costs for the specified period.
@@ -103,22 +156,7 @@ class ClickHouseCloudBilling:
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
 
-        url = f"{API_BASE_URL}/organizations/{self.organization_id}/usageCost"
-        params = {
-            "from_date": start_date.isoformat(),
-            "to_date": end_date.isoformat(),
-        }
-
-        with httpx.Client() as client:
-            response = client.get(
-                url,
-                params=params,
-                auth=(self.api_key_id, self.api_key_secret),
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-
+        data = self._get_usage_data(start_date, end_date)
         return self._parse_usage_cost(data, start_date, end_date)
 
     def _parse_usage_cost(
@@ -147,27 +185,16 @@ class ClickHouseCloudBilling:
         Returns:
             List of UsageCost, one per day
         """
-        results = []
         end_date = date.today()
-
-        for i in range(days):
-            day = end_date - timedelta(days=i)
-            url = f"{API_BASE_URL}/organizations/{self.organization_id}/usageCost"
-            params = {
-                "from_date": day.isoformat(),
-                "to_date": day.isoformat(),
-            }
-
-            with httpx.Client() as client:
-                response = client.get(
-                    url,
-                    params=params,
-                    auth=(self.api_key_id, self.api_key_secret),
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-            results.append(self._parse_usage_cost(data, day, day))
-
-        return list(reversed(results))  # Chronological order
+        days_to_query = [end_date - timedelta(days=i) for i in range(days - 1, -1, -1)]
+        if not days_to_query:
+            return []
+
+        def fetch_day(day: date) -> UsageCost:
+            return self._parse_usage_cost(self._get_usage_data(day, day), day, day)
+
+        # The API has no per-day granularity, so overlap the requests instead;
+        # map() keeps chronological order
+        workers = min(MAX_CONCURRENT_REQUESTS, len(days_to_query))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fetch_day, days_to_query))
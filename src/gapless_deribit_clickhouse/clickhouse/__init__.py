@@ -5,9 +5,14 @@ ADR: 2025-12-03-deribit-options-clickhouse-pipeline
 """
 
 from gapless_deribit_clickhouse.clickhouse.config import get_credentials
-from gapless_deribit_clickhouse.clickhouse.connection import get_client, test_connection
+from gapless_deribit_clickhouse.clickhouse.connection import (
+    close_client,
+    get_client,
+    test_connection,
+)
 
 __all__ = [
+    "close_client",
     "get_client",
     "get_credentials",
     "test_connection",
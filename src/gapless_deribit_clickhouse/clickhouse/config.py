@@ -2,7 +2,7 @@
 ClickHouse credential resolution for gapless-deribit-clickhouse.
 
 Resolution order:
-1. .env file (auto-loaded via python-dotenv)
+1. .env file (nearest to this package or the working directory)
 2. Environment variables (CLICKHOUSE_HOST_READONLY, etc.)
 3. Raise CredentialError with setup instructions
 
@@ -11,9 +11,9 @@ ADR: 2025-12-07-schema-first-e2e-validation
 
 from __future__ import annotations
 
+import functools
 import os
-
-from dotenv import load_dotenv
+from pathlib import Path
 
 from gapless_deribit_clickhouse.exceptions import CredentialError
 
@@ -27,13 +27,60 @@ ENV_PASSWORD = "CLICKHOUSE_PASSWORD_READONLY"
 DEFAULT_PORT = 443
 DEFAULT_SECURE = True
 
+ENV_FILENAME = ".env"
+
+
+def _find_env_file() -> Path | None:
+    """
+    Locate the nearest .env file.
+
+    Mirrors python-dotenv's discovery: walk up from this module's directory
+    (the project root in a checkout), then from the working directory.
+    """
+    for start in (Path(__file__).resolve().parent, Path.cwd()):
+        for directory in (start, *start.parents):
+            candidate = directory / ENV_FILENAME
+            if candidate.is_file():
+                return candidate
+    return None
 
+
+def _parse_env_file(path: Path) -> dict[str, str]:
+    """
+    Parse KEY=VALUE lines from a .env file.
+
+    Handles the subset of dotenv syntax used by .env.example: blank lines,
+    ``#`` comments, an optional ``export`` prefix, quoted values, and
+    trailing `` #`` comments on unquoted values. No variable expansion.
+    """
+    values: dict[str, str] = {}
+    for raw_line in path.read_text(encoding="utf-8").splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        line = line.removeprefix("export ").lstrip()
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
+            value = value[1:-1]
+        else:
+            value = value.split(" #", 1)[0].rstrip()
+        values[key.strip()] = value
+    return values
+
+
+@functools.cache
 def get_credentials() -> tuple[str, str, str]:
     """
     Resolve ClickHouse credentials from .env or environment variables.
 
+    The first successful lookup is memoized for the life of the process
+    (failures are not cached); call get_credentials.cache_clear() to re-read.
+
     Resolution order:
-    1. .env file (auto-loaded via python-dotenv)
+    1. .env file (nearest to this package or the working directory)
     2. Environment variables (CLICKHOUSE_HOST_READONLY, etc.)
     3. Raise CredentialError with setup instructions
 
@@ -44,8 +91,10 @@ def get_credentials() -> tuple[str, str, str]:
         CredentialError: If credentials cannot be resolved
     """
     # Load .env file if present (populates os.environ)
-    # override=True ensures .env takes precedence over existing env vars
-    load_dotenv(override=True)
+    # .env values take precedence over existing env vars (dotenv override=True)
+    env_file = _find_env_file()
+    if env_file is not None:
+        os.environ.update(_parse_env_file(env_file))
 
     # Read from env vars (populated by .env or set directly)
     host = os.environ.get(ENV_HOST)
@@ -11,8 +11,13 @@ ADR: 2025-12-08-clickhouse-data-pipeline-architecture (dual-mode)
 
 from __future__ import annotations
 
+import atexit
 import os
-from typing import TYPE_CHECKING
+import threading
+from typing import Any
+
+import clickhouse_connect
+from clickhouse_connect.driver import httputil
 
 from gapless_deribit_clickhouse.clickhouse.config import (
     DEFAULT_PORT,
@@ -21,9 +26,6 @@ from gapless_deribit_clickhouse.clickhouse.config import (
 )
 from gapless_deribit_clickhouse.exceptions import ConnectionError
 
-if TYPE_CHECKING:
-    import clickhouse_connect
-
 # Environment variable names for local mode
 ENV_MODE = "CLICKHOUSE_MODE"
 ENV_LOCAL_HOST = "CLICKHOUSE_LOCAL_HOST"
@@ -34,11 +36,30 @@ ENV_LOCAL_PORT = "CLICKHOUSE_LOCAL_PORT"
 LOCAL_DEFAULT_HOST = "localhost"
 LOCAL_DEFAULT_PORT = 8123
 
+# Wire compression for cloud traffic: egress is billed per GB, and ZSTD compresses
+# the Native result blocks noticeably better than the default LZ4. clickhouse-connect
+# also uses it as the write codec, so collector insert_df() batches are sent
+# ZSTD-compressed (local clients keep the library default, LZ4 both ways)
+CLOUD_COMPRESSION = "zstd"
+
+# HTTP connection pool sizing (urllib3 PoolManager shared by cached clients)
+# block=True makes callers wait for a free keep-alive connection instead of
+# opening (and TLS-handshaking) throwaway ones when the pool is exhausted
+POOL_MAXSIZE = 32
+POOL_NUM_POOLS = 8
+
+# One client per resolved mode, reused across get_client() calls
+_clients: dict[str, clickhouse_connect.driver.Client] = {}
+_clients_lock = threading.Lock()
+
 
 def get_client(mode: str | None = None) -> clickhouse_connect.driver.Client:
     """
     Get ClickHouse client based on mode (local or cloud).
 
+    Clients are cached per mode, so repeated calls reuse the same HTTP
+    keep-alive connections instead of reconnecting.
+
     Args:
         mode: Connection mode - "local" or "cloud". Defaults to CLICKHOUSE_MODE
               env var, falling back to "cloud".
@@ -53,15 +74,42 @@ def get_client(mode: str | None = None) -> clickhouse_connect.driver.Client:
     # Resolve mode from parameter or environment
     resolved_mode = mode or os.environ.get(ENV_MODE, "cloud")
 
-    if resolved_mode == "local":
-        return _get_local_client()
-    return _get_cloud_client()
+    client = _clients.get(resolved_mode)
+    if client is not None:
+        return client
+
+    # Double-checked under the lock: concurrent backfill threads share one client
+    with _clients_lock:
+        client = _clients.get(resolved_mode)
+        if client is None:
+            client = _get_local_client() if resolved_mode == "local" else _get_cloud_client()
+            _clients[resolved_mode] = client
+    return client
+
+
+def close_client() -> None:
+    """Close and forget all cached clients (registered with atexit)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+atexit.register(close_client)
+
+
+def _get_pool_manager() -> Any:
+    """Build a keep-alive urllib3 pool manager sized for concurrent queries."""
+    return httputil.get_pool_manager(
+        maxsize=POOL_MAXSIZE,
+        num_pools=POOL_NUM_POOLS,
+        block=True,
+    )
 
 
 def _get_local_client() -> clickhouse_connect.driver.Client:
     """Get client for local ClickHouse (development/backtesting)."""
-    import clickhouse_connect
-
     host = os.environ.get(ENV_LOCAL_HOST, LOCAL_DEFAULT_HOST)
     port = int(os.environ.get(ENV_LOCAL_PORT, LOCAL_DEFAULT_PORT))
 
@@ -71,6 +119,9 @@ def _get_local_client() -> clickhouse_connect.driver.Client:
             port=port,
             username="default",
             password="",
+            pool_mgr=_get_pool_manager(),
+            # Cached client is shared; sessions would serialize concurrent queries
+            autogenerate_session_id=False,
         )
     except Exception as e:
         raise ConnectionError(
@@ -81,8 +132,6 @@ def _get_local_client() -> clickhouse_connect.driver.Client:
 
 def _get_cloud_client() -> clickhouse_connect.driver.Client:
     """Get client for ClickHouse Cloud (production)."""
-    import clickhouse_connect
-
     host, user, password = get_credentials()
 
     try:
@@ -92,6 +141,10 @@ def _get_cloud_client() -> clickhouse_connect.driver.Client:
             username=user,
             password=password,
             secure=DEFAULT_SECURE,
+            compress=CLOUD_COMPRESSION,
+            pool_mgr=_get_pool_manager(),
+            # Cached client is shared; sessions would serialize concurrent queries
+            autogenerate_session_id=False,
         )
     except Exception as e:
         raise ConnectionError(
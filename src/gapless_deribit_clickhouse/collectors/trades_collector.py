@@ -17,22 +17,50 @@ ADR: 2025-12-10-schema-optimization (memory-bounded collection)
 
 from __future__ import annotations
 
+import atexit
 import hashlib
+import importlib.util
 import json
 import logging
 import os
-from datetime import datetime
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 import httpx
+import numpy as np
 import pandas as pd
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from gapless_deribit_clickhouse.clickhouse.connection import get_client
-from gapless_deribit_clickhouse.exceptions import APIError
+from gapless_deribit_clickhouse.exceptions import APIError, RateLimitError
 from gapless_deribit_clickhouse.utils.instrument_parser import parse_instrument
 
+try:
+    # Optional: parses the ~1000-trade pages straight from bytes, several times
+    # faster than stdlib json (pip install 'gapless-deribit-clickhouse[fast-json]')
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: insert batches as raw Arrow buffers
+    # (pip install 'gapless-deribit-clickhouse[arrow]')
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 logger = logging.getLogger(__name__)
 
 # API configuration
@@ -44,59 +72,234 @@ DEFAULT_COUNT = 1000  # Max trades per request
 REQUEST_TIMEOUT_SECONDS = 30
 MAX_RETRIES = 3
 
+# Only transient failures are retried: a 4xx/API error is a definitive answer,
+# and re-requesting it just burns rate-limit budget (TimeoutException is a
+# TransportError subclass)
+RETRYABLE_EXCEPTIONS = (httpx.TransportError, RateLimitError)
+
 # HTTP status codes
 HTTP_OK = 200
+HTTP_TOO_MANY_REQUESTS = 429
+
+# Adaptive request pacing (AIMD): +RATE_INCREASE req/s per success, x RATE_DECREASE_FACTOR
+# on 429, bounded to [MIN_REQUEST_RATE, MAX_REQUEST_RATE] (Deribit public limit ~20 req/s)
+MAX_REQUEST_RATE = 20.0
+MIN_REQUEST_RATE = 0.5
+RATE_INCREASE = 0.5
+RATE_DECREASE_FACTOR = 0.5
+
+# Keep-alive pool for the history API (one host; pages are fetched back to back)
+MAX_KEEPALIVE_CONNECTIONS = 20
+MAX_CONNECTIONS = 100
+KEEPALIVE_EXPIRY_SECONDS = 60.0
 
 # Progress logging interval
 PROGRESS_LOG_INTERVAL_SECONDS = 30
 
 # Checkpoint configuration
 DEFAULT_CHECKPOINT_DIR = Path("tmp/checkpoints")
-BATCH_SIZE_FOR_INSERT = 10000  # Insert every N trades
+# Insert batches: flush at one ClickHouse block (65536 rows) so each insert
+# creates one well-sized part, or earlier if the estimated payload gets large
+BATCH_SIZE_FOR_INSERT = int(os.environ.get("INSERT_BATCH_ROWS", "65536"))
+BATCH_SIZE_FOR_INSERT_BYTES = int(os.environ.get("INSERT_BATCH_BYTES", str(64 * 1024 * 1024)))
+
+# Pagination validation (.mise.toml), read once at import rather than per page
+PAGINATION_GAP_THRESHOLD_MS = int(os.environ.get("PAGINATION_GAP_THRESHOLD_MS", "1000"))
+PAGINATION_LOG_WARNINGS = os.environ.get("PAGINATION_LOG_WARNINGS", "true").lower() == "true"
+
+# Concurrent pagination: the range is walked as adaptive time windows, up to
+# PAGINATION_WORKERS paginated at once (all paced by the shared rate limiter).
+# Each window is resized toward WINDOW_TARGET_TRADES, clamped to [1 min, 30 days]
+PAGINATION_WORKERS = int(os.environ.get("PAGINATION_WORKERS", "8"))
+WINDOW_TARGET_TRADES = 5 * DEFAULT_COUNT
+_INITIAL_WINDOW_MS = 3_600_000  # 1 hour
+_MIN_WINDOW_MS = 60_000
+_MAX_WINDOW_MS = 30 * 86_400_000
+
+# Page narrowing: once a full page has been seen, each request asks for about
+# PAGE_SPAN_SAFETY pages' worth of time at the recent trade density (EMA over
+# ~5 pages) instead of the whole remaining range, keeping server-side scans small
+PAGE_SPAN_SAFETY = 1.5
+PAGE_DENSITY_EMA_ALPHA = 1 / 3
+
+# Opt-in page cache for re-runs and overlapping backfills: pages ending more
+# than PAGE_CACHE_MIN_AGE_MS ago are immutable and kept on disk indefinitely.
+# Recent pages are always fetched (new trades may still land in them)
+PAGE_CACHE_DIR = os.environ.get("TRADES_PAGE_CACHE_DIR", "")
+PAGE_CACHE_MIN_AGE_MS = 7 * 86_400_000
+
+# Concurrent insert workers: overlaps insert round trips to a remote Cloud
+# endpoint. Safe because every batch carries its own deduplication token
+INSERT_WORKERS = 3
+
+# Fixed-width part of a serialized trade row: 7 eight-byte columns (timestamp,
+# price, amount, iv, index_price, mark_price, strike), the 2-byte expiry Date
+# and the 1-byte LowCardinality direction/underlying/option_type keys
+_FIXED_ROW_BYTES = 7 * 8 + 2 + 3
+
+
+class _RateLimiter:
+    """
+    AIMD request pacer shared by all collector threads.
 
+    Starts at max_rate so unthrottled runs are not slowed down; each 429 halves
+    the rate (and honours Retry-After), each success adds back additively, so
+    the pace converges on what the API actually allows.
+    """
 
-def _validate_page_continuity(
-    prev_trades: list[dict[str, Any]],
-    curr_trades: list[dict[str, Any]],
-) -> tuple[bool, list[str]]:
+    def __init__(self, max_rate: float, min_rate: float) -> None:
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.current_rate = max_rate
+        self._next_request_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the next request slot, then reserve the following one."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + 1.0 / self.current_rate
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.current_rate = min(self.max_rate, self.current_rate + RATE_INCREASE)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        with self._lock:
+            self.current_rate = max(self.min_rate, self.current_rate * RATE_DECREASE_FACTOR)
+            pause = retry_after if retry_after is not None else 1.0 / self.current_rate
+            self._next_request_at = max(self._next_request_at, time.monotonic() + pause)
+
+
+_RATE_LIMITER = _RateLimiter(MAX_REQUEST_RATE, MIN_REQUEST_RATE)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds (HTTP-date form is ignored)."""
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+# Shared keep-alive client: every page reuses the same TCP/TLS connection
+# instead of handshaking per request
+_http_client: httpx.Client | None = None
+
+# Response compression is negotiated by httpx from the installed decoders
+# (gzip/deflate always; zstd/br via the compression extra). Logged once.
+_content_encoding_logged = False
+
+
+def _get_http_client() -> httpx.Client:
     """
-    Validate no gaps or duplicates between pagination pages.
+    Return the process-wide history API client, creating it on first use.
 
-    Args:
-        prev_trades: Trades from previous page
-        curr_trades: Trades from current page
+    Negotiates HTTP/2 when the optional h2 package is installed.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                max_connections=MAX_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        atexit.register(_http_client.close)
+    return _http_client
 
-    Returns:
-        Tuple of (is_valid, list of warning messages)
+
+@dataclass(frozen=True)
+class _PageSummary:
+    """What continuity validation needs from a page, extracted once per page."""
+
+    trade_ids: frozenset[str]
+    oldest_ts: int
+    newest_ts: int
+
+
+def _summarize_page(
+    trades: list[dict[str, Any]], *, sorted_desc: bool = False
+) -> _PageSummary | None:
+    """
+    Summarize a page for _check_page_continuity (None for an empty page).
+
+    API pages are requested with sorting=desc (checked in _paginate), so with
+    ``sorted_desc`` the timestamp bounds are read from the ends of the page
+    instead of scanning it.
+    """
+    if not trades:
+        return None
+    if sorted_desc:
+        oldest_ts, newest_ts = trades[-1]["timestamp"], trades[0]["timestamp"]
+    else:
+        timestamps = [t["timestamp"] for t in trades]
+        oldest_ts, newest_ts = min(timestamps), max(timestamps)
+    return _PageSummary(
+        trade_ids=frozenset(t["trade_id"] for t in trades),
+        oldest_ts=oldest_ts,
+        newest_ts=newest_ts,
+    )
+
+
+def _check_page_continuity(
+    prev: _PageSummary | None,
+    curr: _PageSummary | None,
+) -> tuple[bool, list[str]]:
+    """
+    Validate no gaps or duplicates between two summarized pages.
+
+    Each page is summarized once and reused as ``prev`` for the next page,
+    instead of rescanning its trades on both sides of the comparison.
     """
     warnings: list[str] = []
 
-    if not prev_trades or not curr_trades:
+    if prev is None or curr is None:
         return True, warnings
 
-    # Check for timestamp gap
-    prev_oldest_ts = min(t["timestamp"] for t in prev_trades)
-    curr_newest_ts = max(t["timestamp"] for t in curr_trades)
-
     # Gap > threshold is suspicious
-    gap_threshold = int(os.environ.get("PAGINATION_GAP_THRESHOLD_MS", "1000"))
-    gap_ms = prev_oldest_ts - curr_newest_ts
+    gap_threshold = PAGINATION_GAP_THRESHOLD_MS
+    gap_ms = prev.oldest_ts - curr.newest_ts
     if gap_ms > gap_threshold:
         warnings.append(f"Gap detected: {gap_ms}ms between pages (threshold: {gap_threshold}ms)")
 
     # Check for duplicates
-    prev_ids = {t["trade_id"] for t in prev_trades}
-    curr_ids = {t["trade_id"] for t in curr_trades}
-    duplicates = prev_ids & curr_ids
+    duplicates = prev.trade_ids & curr.trade_ids
     if duplicates:
         warnings.append(f"Duplicates: {len(duplicates)} trades appear in both pages")
 
     return len(warnings) == 0, warnings
 
 
+def _validate_page_continuity(
+    prev_trades: list[dict[str, Any]],
+    curr_trades: list[dict[str, Any]],
+) -> tuple[bool, list[str]]:
+    """
+    Validate no gaps or duplicates between pagination pages.
+
+    Args:
+        prev_trades: Trades from previous page
+        curr_trades: Trades from current page
+
+    Returns:
+        Tuple of (is_valid, list of warning messages)
+    """
+    return _check_page_continuity(_summarize_page(prev_trades), _summarize_page(curr_trades))
+
+
 @retry(
     stop=stop_after_attempt(MAX_RETRIES),
-    wait=wait_exponential(multiplier=1, min=1, max=10),
+    # Jitter keeps concurrent backfill threads from retrying in lockstep;
+    # a 429's Retry-After is additionally enforced by _RATE_LIMITER.wait()
+    wait=wait_exponential_jitter(initial=1, max=10, jitter=2),
+    retry=retry_if_exception_type(RETRYABLE_EXCEPTIONS),
 )
 def _fetch_trades_page(
     currency: str,
@@ -119,7 +322,8 @@ def _fetch_trades_page(
         API response dict
 
     Raises:
-        APIError: If API returns an error
+        RateLimitError: If the API responds 429 (pace is reduced before retrying)
+        APIError: If API returns an error (not retried)
     """
     params = {
         "currency": currency,
@@ -130,29 +334,85 @@ def _fetch_trades_page(
         "sorting": "desc",  # Most recent first
     }
 
-    with httpx.Client(timeout=REQUEST_TIMEOUT_SECONDS) as client:
-        response = client.get(TRADES_ENDPOINT, params=params)
+    _RATE_LIMITER.wait()
+    response = _get_http_client().get(TRADES_ENDPOINT, params=params)
 
+    if response.status_code == HTTP_TOO_MANY_REQUESTS:
+        _RATE_LIMITER.on_throttle(_parse_retry_after(response.headers.get("Retry-After")))
+        raise RateLimitError(f"Deribit API rate limit exceeded: {response.text}")
     if response.status_code != HTTP_OK:
         raise APIError(f"Deribit API returned {response.status_code}: {response.text}")
 
-    data = response.json()
+    global _content_encoding_logged
+    if not _content_encoding_logged:
+        _content_encoding_logged = True
+        logger.info(
+            "History API response encoding: "
+            f"{response.headers.get('content-encoding', 'identity')} "
+            f"(accepted: {response.request.headers.get('accept-encoding')})"
+        )
+
+    data = _json_loads(response.content)
 
     if "error" in data:
         raise APIError(f"Deribit API error: {data['error']}")
 
+    _RATE_LIMITER.on_success()
     return data.get("result", {})
 
 
-def _generate_deduplication_token(currency: str, start_ts: int, end_ts: int, batch: int) -> str:
+def _fetch_trades_page_cached(
+    currency: str,
+    kind: str,
+    start_timestamp: int,
+    end_timestamp: int,
+    count: int = DEFAULT_COUNT,
+) -> dict[str, Any]:
+    """
+    Fetch a history page through the on-disk page cache (TRADES_PAGE_CACHE_DIR).
+
+    The key covers every request parameter. Only pages old enough to be
+    immutable are cached; with the cache disabled this is _fetch_trades_page.
+    """
+    now_ms = int(time.time() * 1000)
+    if not PAGE_CACHE_DIR or end_timestamp >= now_ms - PAGE_CACHE_MIN_AGE_MS:
+        return _fetch_trades_page(currency, kind, start_timestamp, end_timestamp, count)
+
+    cache_path = (
+        Path(PAGE_CACHE_DIR) / currency / f"{kind}_{start_timestamp}_{end_timestamp}_{count}.json"
+    )
+    if cache_path.exists():
+        return _json_loads(cache_path.read_bytes())
+
+    result = _fetch_trades_page(currency, kind, start_timestamp, end_timestamp, count)
+    # Per-thread temp file + os.replace: concurrent writers never expose a partial page
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(_json_dumps(result))
+    os.replace(tmp_path, cache_path)
+    return result
+
+
+def _generate_deduplication_token(currency: str, df: pd.DataFrame) -> str:
     """
     Generate unique deduplication token for ClickHouse insert.
 
-    Token is based on currency, time range, and batch number.
-    ClickHouse will reject duplicate inserts with same token.
+    Token is derived from the batch contents: currency, oldest and newest
+    timestamp, first and last trade_id, and row count. Batch boundaries
+    depend on pagination state that is not checkpointed (window sizes, page
+    narrowing), so a resumed backfill may cut different batches than the
+    interrupted run; an ordinal batch number would then give a new batch an
+    old token and ClickHouse would silently drop it. The token is an opaque
+    key, so a 128-bit BLAKE2b digest (32 hex chars) replaces truncated
+    SHA-256.
     """
-    token_input = f"{currency}:{start_ts}:{end_ts}:{batch}"
-    return hashlib.sha256(token_input.encode()).hexdigest()[:32]
+    timestamps = df["timestamp"]
+    trade_ids = df["trade_id"]
+    token_input = (
+        f"{currency}:{timestamps.min()}:{timestamps.max()}:"
+        f"{trade_ids.iloc[0]}:{trade_ids.iloc[-1]}:{len(df)}"
+    )
+    return hashlib.blake2b(token_input.encode(), digest_size=16).hexdigest()
 
 
 def _get_checkpoint_path(currency: str, start_ts: int, end_ts: int) -> Path:
@@ -161,17 +421,96 @@ def _get_checkpoint_path(currency: str, start_ts: int, end_ts: int) -> Path:
     return DEFAULT_CHECKPOINT_DIR / f"{checkpoint_id}.json"
 
 
+def _json_loads(content: bytes) -> Any:
+    """Decode JSON bytes with orjson when installed, else stdlib json."""
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode compact JSON bytes with orjson when installed, else stdlib json."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
 def _load_checkpoint(checkpoint_path: Path) -> dict[str, Any] | None:
     """Load checkpoint from file if exists."""
     if not checkpoint_path.exists():
         return None
-    return json.loads(checkpoint_path.read_text())
+    return _json_loads(checkpoint_path.read_bytes())
 
 
 def _save_checkpoint(checkpoint_path: Path, checkpoint: dict[str, Any]) -> None:
-    """Save checkpoint to file."""
+    """
+    Save checkpoint to file atomically.
+
+    Writes compact JSON to a sibling temp file, fsyncs it, then os.replace()s
+    it over the checkpoint, so a crash mid-write leaves the previous
+    checkpoint intact instead of a truncated one.
+    """
     checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
-    checkpoint_path.write_text(json.dumps(checkpoint, indent=2))
+    tmp_path = checkpoint_path.with_suffix(".json.tmp")
+    with tmp_path.open("wb") as f:
+        f.write(_json_dumps(checkpoint))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, checkpoint_path)
+
+
+class _CheckpointWriter:
+    """
+    Background checkpoint writer, newest-wins per checkpoint file.
+
+    submit() only records the checkpoint; a daemon thread performs the atomic
+    write, so fsync latency stays off the collection loop. A checkpoint that
+    is superseded before it is written is dropped (it would be stale anyway).
+    A lost write only makes a resume re-insert batches, which the
+    deduplication tokens make idempotent.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[Path, dict[str, Any]] = {}
+        self._writing = False
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, checkpoint_path: Path, checkpoint: dict[str, Any]) -> None:
+        """Queue a checkpoint write, replacing any pending one for the same file."""
+        with self._cond:
+            self._pending[checkpoint_path] = checkpoint
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trades-checkpoint", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until every submitted checkpoint has been written."""
+        with self._cond:
+            while self._pending or self._writing:
+                self._cond.wait()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                checkpoint_path = next(iter(self._pending))
+                checkpoint = self._pending.pop(checkpoint_path)
+                self._writing = True
+            try:
+                _save_checkpoint(checkpoint_path, checkpoint)
+            except Exception as e:  # Keep the writer alive; flush() must not hang
+                logger.warning(f"Failed to write checkpoint {checkpoint_path}: {e}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+
+_CHECKPOINT_WRITER = _CheckpointWriter()
+atexit.register(_CHECKPOINT_WRITER.flush)
 
 
 def _clear_checkpoint(checkpoint_path: Path) -> None:
@@ -180,32 +519,391 @@ def _clear_checkpoint(checkpoint_path: Path) -> None:
         checkpoint_path.unlink()
 
 
-def _trade_to_row(trade: dict[str, Any]) -> dict[str, Any]:
+def _estimate_batch_bytes(trades: list[dict[str, Any]]) -> int:
+    """Approximate serialized insert size of raw trades (strings + fixed columns)."""
+    return sum(len(t["trade_id"]) + len(t["instrument_name"]) + _FIXED_ROW_BYTES for t in trades)
+
+
+def _trades_to_frame(trades: list[dict[str, Any]]) -> pd.DataFrame:
     """
-    Convert API trade dict to database row.
+    Convert API trade dicts to a database-ready DataFrame, column by column.
 
-    Parses instrument name to extract derived fields.
+    Builds one list per column (no per-row dicts) and converts millisecond
+    timestamps in a single vectorized call. Derived instrument fields are
+    parsed once per distinct instrument name and broadcast to rows by
+    factorized code.
 
     ADR: 2025-12-10-deribit-options-alpha-features (mark_price field)
     """
-    instrument_name = trade["instrument_name"]
-    parsed = parse_instrument(instrument_name)
-
-    return {
-        "trade_id": trade["trade_id"],
-        "instrument_name": instrument_name,
-        "timestamp": datetime.fromtimestamp(trade["timestamp"] / 1000),
-        "price": trade["price"],
-        "amount": trade["amount"],
-        "direction": trade["direction"],
-        "iv": trade.get("iv"),
-        "index_price": trade.get("index_price"),
-        "mark_price": trade.get("mark_price"),
-        "underlying": parsed.underlying,
-        "expiry": parsed.expiry,
-        "strike": parsed.strike,
-        "option_type": parsed.option_type,
-    }
+    instrument_names = [trade["instrument_name"] for trade in trades]
+    codes, unique_names = pd.factorize(pd.Series(instrument_names, dtype=object))
+    parsed = [parse_instrument(name) for name in unique_names]
+
+    def broadcast(values: list[Any], dtype: Any = object) -> np.ndarray:
+        return np.asarray(values, dtype=dtype)[codes]
+
+    return pd.DataFrame(
+        {
+            "trade_id": [trade["trade_id"] for trade in trades],
+            "instrument_name": instrument_names,
+            # Epoch ms -> naive UTC datetime64 (what DateTime64(3) stores)
+            "timestamp": pd.to_datetime([trade["timestamp"] for trade in trades], unit="ms"),
+            "price": [trade["price"] for trade in trades],
+            "amount": [trade["amount"] for trade in trades],
+            "direction": [trade["direction"] for trade in trades],
+            "iv": [trade.get("iv") for trade in trades],
+            "index_price": [trade.get("index_price") for trade in trades],
+            "mark_price": [trade.get("mark_price") for trade in trades],
+            "underlying": broadcast([p.underlying for p in parsed]),
+            "expiry": broadcast([p.expiry for p in parsed]),
+            "strike": broadcast([p.strike for p in parsed], np.float64),
+            "option_type": broadcast([p.option_type for p in parsed]),
+        }
+    )
+
+
+def _resolve_time_range(start_date: str | None, end_date: str | None) -> tuple[int, int]:
+    """Convert date strings to millisecond timestamps (defaults: 2018-01-01 to now)."""
+    if start_date:
+        start_ts = int(pd.to_datetime(start_date).timestamp() * 1000)
+    else:
+        # Default to 2018-01-01 (Deribit options launch)
+        start_ts = int(pd.to_datetime("2018-01-01").timestamp() * 1000)
+
+    if end_date:
+        end_ts = int(pd.to_datetime(end_date).timestamp() * 1000)
+    else:
+        end_ts = int(datetime.now().timestamp() * 1000)
+
+    return start_ts, end_ts
+
+
+def _paginate(currency: str, start_ts: int, end_ts: int) -> Iterator[list[dict[str, Any]]]:
+    """
+    Yield non-empty history pages for [start_ts, end_ts], newest first.
+
+    Requests start from the full range; after the first full page they are
+    narrowed to PAGE_SPAN_SAFETY pages at the estimated trade density. A
+    narrowed request that comes back short has covered its slice, so the
+    walk continues just below it (an empty slice also doubles the next one).
+
+    The density estimate is not checkpointed: a resumed backfill restarts
+    from the full range and rebuilds page boundaries, so its pages (and the
+    insert batches cut from them) need not match the interrupted run's. The
+    content-derived deduplication tokens keep that safe.
+    """
+    cursor = end_ts
+    density: float | None = None  # EMA of trades per ms
+    while cursor >= start_ts:
+        request_start = start_ts
+        if density is not None:
+            span_ms = int(PAGE_SPAN_SAFETY * DEFAULT_COUNT / density)
+            request_start = max(start_ts, cursor - span_ms)
+        narrowed = request_start > start_ts
+
+        result = _fetch_trades_page_cached(
+            currency=currency,
+            kind="option",
+            start_timestamp=request_start,
+            end_timestamp=cursor,
+            count=DEFAULT_COUNT,
+        )
+        trades = result.get("trades", [])
+        if not trades:
+            if not narrowed:
+                return
+            density /= 2  # Sparse stretch: widen the next slice
+            cursor = request_start - 1
+            continue
+        # sorting=desc: the last trade is the oldest. The cursor, the density
+        # estimate and _summarize_page(sorted_desc=True) all rely on it, so an
+        # unsorted page fails loudly instead of skipping or repeating trades
+        if trades[-1]["timestamp"] > trades[0]["timestamp"]:
+            raise APIError(
+                f"History page not sorted desc: first trade at {trades[0]['timestamp']}, "
+                f"last at {trades[-1]['timestamp']}"
+            )
+        yield trades
+
+        if len(trades) >= DEFAULT_COUNT:
+            sample = len(trades) / max(trades[0]["timestamp"] - trades[-1]["timestamp"], 1)
+            cursor = trades[-1]["timestamp"] - 1
+        elif narrowed:
+            # Short page: the slice is exhausted, nothing left above request_start
+            sample = len(trades) / (cursor - request_start + 1)
+            cursor = request_start - 1
+        else:
+            cursor = trades[-1]["timestamp"] - 1
+            continue
+        if density is None:
+            density = sample
+        else:
+            density += PAGE_DENSITY_EMA_ALPHA * (sample - density)
+
+
+def _fetch_window(currency: str, start_ts: int, end_ts: int) -> list[list[dict[str, Any]]]:
+    """Paginate one time window to completion (runs on a pagination worker)."""
+    return list(_paginate(currency, start_ts, end_ts))
+
+
+def _iter_pages(currency: str, start_ts: int, end_ts: int) -> Iterator[list[dict[str, Any]]]:
+    """
+    Yield history pages for [start_ts, end_ts], newest first.
+
+    Pages within a window depend on the previous page's cursor, but windows
+    are independent: up to PAGINATION_WORKERS consecutive windows are
+    paginated concurrently and yielded in order, so callers see the same
+    newest-first stream as a serial walk. Like _iter_time_chunks in api.py,
+    each new window is rescaled by WINDOW_TARGET_TRADES / trades_in_window,
+    which keeps the buffered windows (and memory) bounded.
+    """
+    if PAGINATION_WORKERS <= 1:
+        yield from _paginate(currency, start_ts, end_ts)
+        return
+
+    window_ms = _INITIAL_WINDOW_MS
+    window_end = end_ts
+    in_flight: deque[tuple[int, Future[list[list[dict[str, Any]]]]]] = deque()
+
+    with ThreadPoolExecutor(
+        max_workers=PAGINATION_WORKERS, thread_name_prefix="trades-page"
+    ) as executor:
+        try:
+            while in_flight or window_end >= start_ts:
+                while len(in_flight) < PAGINATION_WORKERS and window_end >= start_ts:
+                    window_start = max(start_ts, window_end - window_ms + 1)
+                    future = executor.submit(_fetch_window, currency, window_start, window_end)
+                    in_flight.append((window_end - window_start + 1, future))
+                    window_end = window_start - 1
+
+                span_ms, future = in_flight.popleft()
+                pages = future.result()
+                yield from pages
+
+                window_trades = sum(len(page) for page in pages)
+                window_ms = int(span_ms * WINDOW_TARGET_TRADES / max(window_trades, 1))
+                window_ms = min(max(window_ms, _MIN_WINDOW_MS), _MAX_WINDOW_MS)
+        finally:
+            # Early exit or failure: drop windows that have not started
+            for _, future in in_flight:
+                future.cancel()
+
+
+@dataclass
+class _PendingBatch:
+    """Batch awaiting conversion/insert confirmation before it is checkpointed."""
+
+    trades: list[dict[str, Any]]  # Raw API trades (kept for the retry)
+    batch: int  # Batch number (logging only; the token comes from the contents)
+    future: Future[pd.DataFrame] | None  # None when not inserting to ClickHouse
+    df: pd.DataFrame | None  # Converted inline when not inserting
+    checkpoint: dict[str, Any] | None  # None for the final batch
+
+
+def _convert_and_insert(
+    trades: list[dict[str, Any]],
+    currency: str,
+    batch: int,
+    client: Any | None = None,
+) -> pd.DataFrame:
+    """Convert one raw batch and insert it; runs on an insert worker thread."""
+    df = _trades_to_frame(trades)
+    _insert_trades_with_dedup(df, currency, batch, client=client)
+    return df
+
+
+def _iter_trade_batches(
+    currency: str,
+    start_ts: int,
+    end_ts: int,
+    insert_to_db: bool,
+    resume: bool,
+    stats: dict[str, int],
+) -> Iterator[pd.DataFrame]:
+    """
+    Paginate the history API and yield trades in insert-sized DataFrame batches.
+
+    Inserts run on up to INSERT_WORKERS background threads so pages keep
+    being fetched while earlier batches are written (at most INSERT_WORKERS
+    batches in flight). Batches are confirmed oldest first: each is
+    checkpointed and yielded only once its insert has completed, so consumers
+    only ever see durable data and the checkpoint never skips past a failed
+    insert. A failed insert is retried once with the same deduplication
+    token. Running totals are written into ``stats`` (total_collected,
+    batches, pagination_warnings).
+
+    A resume restarts pagination at the checkpoint's ``last_end_ts`` with
+    fresh window and page-narrowing state, so batch boundaries are rebuilt
+    rather than replayed; only the cursor and running totals carry over.
+    """
+    # Checkpoint management
+    checkpoint_path = _get_checkpoint_path(currency, start_ts, end_ts)
+    checkpoint = _load_checkpoint(checkpoint_path) if resume else None
+
+    if checkpoint:
+        current_end_ts = checkpoint["last_end_ts"]
+        stats["batches"] = checkpoint["batch_number"]
+        stats["total_collected"] = checkpoint["total_collected"]
+        logger.info(
+            f"Resuming from checkpoint: batch {stats['batches']}, "
+            f"{stats['total_collected']} trades collected"
+        )
+    else:
+        current_end_ts = end_ts
+
+    batch_trades: list[dict[str, Any]] = []
+    batch_bytes = 0
+    # Monotonic float: clock-step safe and no datetime allocation per page
+    last_log_time = time.monotonic()
+    prev_page: _PageSummary | None = None
+
+    # Resolved once per backfill rather than per batch; get_client() caches
+    # per mode, so this is the same pooled client other callers share
+    ch_client = get_client() if insert_to_db else None
+
+    executor = (
+        ThreadPoolExecutor(max_workers=INSERT_WORKERS, thread_name_prefix="trades-insert")
+        if insert_to_db
+        else None
+    )
+    pending: deque[_PendingBatch] = deque()
+
+    def submit(resume_end_ts: int | None) -> _PendingBatch:
+        stats["batches"] += 1
+        # Conversion runs on the insert worker too, so the fetch loop only pages
+        future = batch_df = None
+        if executor is not None:
+            future = executor.submit(
+                _convert_and_insert, batch_trades, currency, stats["batches"], client=ch_client
+            )
+        else:
+            batch_df = _trades_to_frame(batch_trades)
+        stats["total_collected"] += len(batch_trades)
+        logger.debug(
+            f"parse_instrument cache at batch {stats['batches']}: {parse_instrument.cache_info()}"
+        )
+        state = None
+        if resume_end_ts is not None:
+            state = {
+                "last_end_ts": resume_end_ts,
+                "batch_number": stats["batches"],
+                "total_collected": stats["total_collected"],
+                "pagination_warnings": stats["pagination_warnings"],
+            }
+        return _PendingBatch(batch_trades, stats["batches"], future, batch_df, state)
+
+    def complete(batch: _PendingBatch) -> pd.DataFrame:
+        batch_df = batch.df
+        if batch.future is not None:
+            try:
+                batch_df = batch.future.result()
+            except Exception as e:
+                logger.warning(f"Insert of batch {batch.batch} failed ({e}), retrying")
+                # Same contents -> same token, so a half-applied insert is not duplicated
+                batch_df = _convert_and_insert(
+                    batch.trades, currency, batch.batch, client=ch_client
+                )
+        # Save checkpoint after successful insert (written in the background)
+        if insert_to_db and batch.checkpoint is not None:
+            _CHECKPOINT_WRITER.submit(
+                checkpoint_path,
+                {**batch.checkpoint, "updated_at": datetime.now(UTC).isoformat()},
+            )
+        return batch_df
+
+    try:
+        for trades in _iter_pages(currency, start_ts, current_end_ts):
+            # Validate page continuity
+            page = _summarize_page(trades, sorted_desc=True)
+            is_valid, warnings = _check_page_continuity(prev_page, page)
+            if not is_valid and PAGINATION_LOG_WARNINGS:
+                for w in warnings:
+                    logger.warning(f"Pagination issue: {w}")
+                stats["pagination_warnings"] += len(warnings)
+
+            prev_page = page  # Track for next iteration
+
+            # Raw trades are converted column-wise once per insert batch
+            batch_trades.extend(trades)
+            batch_bytes += _estimate_batch_bytes(trades)
+
+            # Resume cursor: everything newer than this page has been consumed
+            current_end_ts = trades[-1]["timestamp"] - 1
+
+            # Hand the batch to the insert workers; once INSERT_WORKERS are in
+            # flight, confirm, checkpoint and yield the oldest
+            if (
+                len(batch_trades) >= BATCH_SIZE_FOR_INSERT
+                or batch_bytes >= BATCH_SIZE_FOR_INSERT_BYTES
+            ):
+                pending.append(submit(current_end_ts))
+                batch_trades = []
+                batch_bytes = 0
+                if len(pending) >= INSERT_WORKERS:
+                    yield complete(pending.popleft())
+
+            # Progress logging
+            now = time.monotonic()
+            if now - last_log_time >= PROGRESS_LOG_INTERVAL_SECONDS:
+                collected = stats["total_collected"] + len(batch_trades)
+                logger.info(f"Collected {collected} trades so far (batch {stats['batches']})...")
+                last_log_time = now
+
+        # Insert remaining trades (no checkpoint: completion clears it)
+        if batch_trades:
+            pending.append(submit(None))
+        while pending:
+            yield complete(pending.popleft())
+    finally:
+        # Waits for running inserts if the consumer stops early or we fail and
+        # drops queued ones. Neither is checkpointed, although up to
+        # INSERT_WORKERS - 1 of them may have landed: a resume rebuilds those
+        # rows, and the content-derived token dedupes an identical batch
+        # (a differently cut one collapses on trade_id in ReplacingMergeTree)
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        # Land the newest checkpoint before returning or propagating an error
+        _CHECKPOINT_WRITER.flush()
+
+    # Clear checkpoint on successful completion
+    _clear_checkpoint(checkpoint_path)
+
+    logger.info(
+        f"Collected {stats['total_collected']} total trades in {stats['batches']} batches"
+    )
+
+
+def collect_trades_iter(
+    currency: str = "BTC",
+    start_date: str | None = None,
+    end_date: str | None = None,
+    insert_to_db: bool = True,
+    resume: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """
+    Collect historical options trades from Deribit as a stream of batches.
+
+    Streaming counterpart of collect_trades(): yields one DataFrame per insert
+    batch (~BATCH_SIZE_FOR_INSERT rows, newest first) so callers can process
+    arbitrarily long backfills with memory bounded by a single batch.
+
+    Args:
+        currency: "BTC" or "ETH"
+        start_date: Start date string (e.g., "2024-01-01")
+        end_date: End date string (defaults to now)
+        insert_to_db: If True, insert each batch to ClickHouse before yielding it
+        resume: If True, resume from checkpoint if available
+
+    Yields:
+        DataFrame per batch of collected trades
+    """
+    start_ts, end_ts = _resolve_time_range(start_date, end_date)
+    logger.info(
+        f"Collecting {currency} options trades from {start_date or '2018-01-01'} "
+        f"to {end_date or 'now'}"
+    )
+    stats = {"total_collected": 0, "batches": 0, "pagination_warnings": 0}
+    yield from _iter_trade_batches(currency, start_ts, end_ts, insert_to_db, resume, stats)
 
 
 def collect_trades(
@@ -214,7 +912,7 @@ def collect_trades(
     end_date: str | None = None,
     insert_to_db: bool = True,
     resume: bool = True,
-    return_data: bool = True,
+    return_data: bool | None = None,
     max_memory_rows: int = 100_000,
 ) -> pd.DataFrame | dict[str, Any]:
     """
@@ -225,9 +923,11 @@ def collect_trades(
     last checkpoint.
 
     Memory Management (ADR: 2025-12-10-pipeline-memory-optimization):
-    - For large backfills, set return_data=False to avoid memory exhaustion
+    - When inserting to ClickHouse no rows are retained by default
+      (return_data defaults to not insert_to_db); memory stays O(batch size)
     - max_memory_rows limits in-memory accumulation (default 100k rows)
     - Data is streamed to DB in batches, not accumulated in memory
+    - Use collect_trades_iter() to process batches as they arrive
 
     Args:
         currency: "BTC" or "ETH"
@@ -237,6 +937,8 @@ def collect_trades(
         resume: If True, resume from checkpoint if available
         return_data: If True, return DataFrame (limited by max_memory_rows).
                     If False, return stats dict only (for large backfills).
+                    Defaults to ``not insert_to_db``: a dry run returns the
+                    data, a DB backfill returns stats.
         max_memory_rows: Maximum rows to keep in memory when return_data=True.
                         Older rows are discarded to prevent memory exhaustion.
 
@@ -244,144 +946,52 @@ def collect_trades(
         If return_data=True: DataFrame with collected trades (up to max_memory_rows)
         If return_data=False: Dict with collection stats (total_collected, batches, etc.)
     """
-    # Convert dates to timestamps
-    if start_date:
-        start_ts = int(pd.to_datetime(start_date).timestamp() * 1000)
-    else:
-        # Default to 2018-01-01 (Deribit options launch)
-        start_ts = int(pd.to_datetime("2018-01-01").timestamp() * 1000)
+    if return_data is None:
+        return_data = not insert_to_db
 
-    if end_date:
-        end_ts = int(pd.to_datetime(end_date).timestamp() * 1000)
-    else:
-        end_ts = int(datetime.now().timestamp() * 1000)
-
-    # Checkpoint management
-    checkpoint_path = _get_checkpoint_path(currency, start_ts, end_ts)
-    checkpoint = _load_checkpoint(checkpoint_path) if resume else None
-
-    if checkpoint:
-        current_end_ts = checkpoint["last_end_ts"]
-        batch_number = checkpoint["batch_number"]
-        total_collected = checkpoint["total_collected"]
-        logger.info(
-            f"Resuming from checkpoint: batch {batch_number}, {total_collected} trades collected"
-        )
-    else:
-        current_end_ts = end_ts
-        batch_number = 0
-        total_collected = 0
+    start_ts, end_ts = _resolve_time_range(start_date, end_date)
 
     start_label = start_date or "2018-01-01"
     end_label = end_date or "now"
     logger.info(f"Collecting {currency} options trades from {start_label} to {end_label}")
 
     # ADR: 2025-12-10-pipeline-memory-optimization
-    # Memory-bounded collection: only accumulate if return_data=True
-    # Use collections.deque with maxlen for bounded memory
-    from collections import deque
-
-    recent_trades: deque[dict[str, Any]] = deque(maxlen=max_memory_rows if return_data else 0)
-    batch_trades: list[dict[str, Any]] = []
-    last_log_time = datetime.now()
-    prev_trades: list[dict[str, Any]] = []
-    pagination_warnings = 0
-
-    while current_end_ts > start_ts:
-        result = _fetch_trades_page(
-            currency=currency,
-            kind="option",
-            start_timestamp=start_ts,
-            end_timestamp=current_end_ts,
-        )
-
-        trades = result.get("trades", [])
-        if not trades:
-            break
-
-        # Validate page continuity
-        log_warnings = os.environ.get("PAGINATION_LOG_WARNINGS", "true").lower() == "true"
-        is_valid, warnings = _validate_page_continuity(prev_trades, trades)
-        if not is_valid and log_warnings:
-            for w in warnings:
-                logger.warning(f"Pagination issue: {w}")
-            pagination_warnings += len(warnings)
-
-        prev_trades = trades  # Track for next iteration
-
-        # Convert to rows
-        rows = [_trade_to_row(trade) for trade in trades]
-        # Memory-bounded: recent_trades has maxlen, older rows auto-discarded
-        if return_data:
-            recent_trades.extend(rows)
-        batch_trades.extend(rows)
-
-        # Update cursor for next page
-        oldest_timestamp = min(trade["timestamp"] for trade in trades)
-        current_end_ts = oldest_timestamp - 1
-
-        # Insert batch and checkpoint when threshold reached
-        if insert_to_db and len(batch_trades) >= BATCH_SIZE_FOR_INSERT:
-            batch_number += 1
-            _insert_trades_with_dedup(
-                pd.DataFrame(batch_trades),
-                currency,
-                start_ts,
-                end_ts,
-                batch_number,
-            )
-            total_collected += len(batch_trades)
-            batch_trades = []
-
-            # Save checkpoint after successful insert
-            _save_checkpoint(checkpoint_path, {
-                "last_end_ts": current_end_ts,
-                "batch_number": batch_number,
-                "total_collected": total_collected,
-                "pagination_warnings": pagination_warnings,
-                "updated_at": datetime.now().isoformat(),
-            })
-
-        # Progress logging
-        if (datetime.now() - last_log_time).seconds >= PROGRESS_LOG_INTERVAL_SECONDS:
-            collected = total_collected + len(batch_trades)
-            logger.info(f"Collected {collected} trades so far (batch {batch_number})...")
-            last_log_time = datetime.now()
-
-    # Insert remaining trades
-    if insert_to_db and batch_trades:
-        batch_number += 1
-        _insert_trades_with_dedup(
-            pd.DataFrame(batch_trades),
-            currency,
-            start_ts,
-            end_ts,
-            batch_number,
-        )
-        total_collected += len(batch_trades)
-
-    # Clear checkpoint on successful completion
-    _clear_checkpoint(checkpoint_path)
-
-    logger.info(f"Collected {total_collected} total trades in {batch_number} batches")
+    # Memory-bounded collection: only accumulate if return_data=True.
+    # Keep whole batches and drop the oldest once max_memory_rows is covered.
+    recent_batches: deque[pd.DataFrame] = deque()
+    recent_rows = 0
+    stats = {"total_collected": 0, "batches": 0, "pagination_warnings": 0}
+
+    for batch_df in _iter_trade_batches(currency, start_ts, end_ts, insert_to_db, resume, stats):
+        if not return_data:
+            continue
+        recent_batches.append(batch_df)
+        recent_rows += len(batch_df)
+        while recent_batches and recent_rows - len(recent_batches[0]) >= max_memory_rows:
+            recent_rows -= len(recent_batches.popleft())
 
     # ADR: 2025-12-10-pipeline-memory-optimization
     # Return stats dict for large backfills (return_data=False)
     # Return bounded DataFrame for small collections (return_data=True)
     if not return_data:
         return {
-            "total_collected": total_collected,
-            "batches": batch_number,
-            "pagination_warnings": pagination_warnings,
+            "total_collected": stats["total_collected"],
+            "batches": stats["batches"],
+            "pagination_warnings": stats["pagination_warnings"],
             "currency": currency,
             "start_date": start_label,
             "end_date": end_label,
         }
 
-    if not recent_trades:
+    if not recent_batches or max_memory_rows <= 0:
         return pd.DataFrame()
 
-    return pd.DataFrame(list(recent_trades))
+    # Trim the oldest batch before concatenating so rows beyond
+    # max_memory_rows are never copied into the result
+    excess = recent_rows - max_memory_rows
+    if excess > 0:
+        recent_batches[0] = recent_batches[0].iloc[excess:]
+    return pd.concat(recent_batches, ignore_index=True)
 
 
 def _insert_trades(df: pd.DataFrame) -> None:
@@ -391,13 +1001,8 @@ def _insert_trades(df: pd.DataFrame) -> None:
 
     client = get_client()
 
-    # Convert to format expected by ClickHouse
-    # Note: clickhouse-connect handles the conversion
-    client.insert(
-        "deribit.options_trades",
-        df.to_dict("records"),
-        column_names=list(df.columns),
-    )
+    # Columnar insert: one array per column, no per-row dict materialization
+    client.insert_df("deribit.options_trades", df)
 
     logger.info(f"Inserted {len(df)} trades to ClickHouse")
 
@@ -405,32 +1010,39 @@ def _insert_trades(df: pd.DataFrame) -> None:
 def _insert_trades_with_dedup(
     df: pd.DataFrame,
     currency: str,
-    start_ts: int,
-    end_ts: int,
     batch: int,
+    client: Any | None = None,
 ) -> None:
     """
     Insert trades DataFrame to ClickHouse with deduplication token.
 
     Uses insert_deduplication_token setting to ensure idempotent inserts.
-    If the same batch is inserted twice (e.g., after a retry), ClickHouse
-    will reject the duplicate.
+    If the same batch is inserted twice (e.g., after a retry or a resume that
+    rebuilds it), ClickHouse will reject the duplicate; ``batch`` is only
+    used for logging. Pass ``client`` to reuse one connection across
+    batches; defaults to get_client().
+
+    With pyarrow installed the batch is sent as an Arrow table (FORMAT Arrow),
+    which the server decodes directly instead of clickhouse-connect converting
+    every column to Native in Python; otherwise it falls back to insert_df.
     """
     if df.empty:
         return
 
-    client = get_client()
+    if client is None:
+        client = get_client()
 
     # Generate unique token for this batch
-    dedup_token = _generate_deduplication_token(currency, start_ts, end_ts, batch)
+    dedup_token = _generate_deduplication_token(currency, df)
 
     # Insert with deduplication token
     # Note: Requires ReplicatedMergeTree or SharedMergeTree (ClickHouse Cloud)
-    # Pass DataFrame directly - clickhouse-connect handles conversion
-    client.insert_df(
-        "deribit.options_trades",
-        df,
-        settings={"insert_deduplication_token": dedup_token},
-    )
+    # async_insert=0: the token (and the checkpoint after it) need a synchronous insert
+    settings = {"insert_deduplication_token": dedup_token, "async_insert": 0}
+    if pa is not None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        client.insert_arrow("deribit.options_trades", table, settings=settings)
+    else:
+        client.insert_df("deribit.options_trades", df, settings=settings)
 
     logger.info(f"Inserted batch {batch}: {len(df)} trades (dedup_token: {dedup_token[:8]}...)")
@@ -31,11 +31,16 @@ from gapless_deribit_clickhouse.features.config import (
 # Phase 2: Contract Selection & Spot Integration
 from gapless_deribit_clickhouse.features.contract_selector import (
     build_contract_selection_query,
+    build_query_parameters,
     select_contracts,
 )
 
 # Phase 1: IV-Only Features
-from gapless_deribit_clickhouse.features.dte_buckets import dte_bucket_agg
+from gapless_deribit_clickhouse.features.dte_buckets import (
+    build_dte_bucket_query,
+    dte_bucket_agg,
+    dte_bucket_agg_sql,
+)
 from gapless_deribit_clickhouse.features.egarch import (
     auto_select_egarch,
     fit_egarch,
@@ -70,11 +75,14 @@ __all__ = [
     "term_structure_slope",
     "pcr_by_tenor",
     "dte_bucket_agg",
+    "build_dte_bucket_query",
+    "dte_bucket_agg_sql",
     "fit_egarch",
     "auto_select_egarch",
     "forecast_volatility",
     # Phase 2: Contract Selection
     "build_contract_selection_query",
+    "build_query_parameters",
     "select_contracts",
     # Phase 2: Spot Integration
     "build_spot_enriched_query",
@@ -8,16 +8,17 @@ This module provides contract selection strategies for options analysis:
 - Liquidity filter: Contracts meeting minimum volume threshold
 
 Performance Optimization:
-- Uses argMin(tuple(*), dte) instead of ROW_NUMBER() window functions
-- Aggregate functions have lower memory overhead in ClickHouse
+- Front-month uses ORDER BY ... LIMIT 1 BY instead of ROW_NUMBER() window
+  functions or argMin(tuple(*), dte), so no per-group tuple state is kept
 - All filtering computed server-side before data transfer
+- Selected rows carry a server-computed dte column (read by dte_bucket_agg)
 
-Reference: https://medium.com/insiderengineering/clickhouse-query-optimization-argmax-vs-final
+Reference: https://clickhouse.com/docs/en/sql-reference/statements/select/limit-by
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 if TYPE_CHECKING:
     import pandas as pd
@@ -29,36 +30,34 @@ from gapless_deribit_clickhouse.features.config import DEFAULT_CONFIG, FeatureCo
 ContractStrategy = Literal["all", "front_month", "front_atm", "front_atm_liquid"]
 
 # SQL query templates
-# Note: Using argMin for front-month selection (more efficient than window functions)
+# Filter values are substituted either as quoted literals or, for executed
+# queries, as server-side bound parameters (see _filter_values)
+# Note: LIMIT 1 BY keeps the first row per (ts, underlying) in ORDER BY order,
+# i.e. the nearest expiry, without an aggregate state per group
 
 FRONT_MONTH_QUERY = """
 -- Front-month selection: nearest expiry per 15-min bucket
--- Uses argMin(tuple(*), dte) aggregate instead of ROW_NUMBER()
+-- ORDER BY ... LIMIT 1 BY: streams rows, no per-group aggregate state
 SELECT
     toStartOfFifteenMinutes(timestamp) AS ts,
     underlying,
-    -- argMin returns the entire row (as tuple) with minimum DTE
-    (argMin(
-        tuple(
-            timestamp,
-            instrument_name,
-            strike,
-            expiry,
-            option_type,
-            iv,
-            price,
-            amount,
-            direction,
-            index_price
-        ),
-        dateDiff('day', toDate(timestamp), expiry)
-    )).*
+    timestamp,
+    instrument_name,
+    strike,
+    expiry,
+    option_type,
+    iv,
+    price,
+    amount,
+    direction,
+    index_price,
+    dateDiff('day', toDate(timestamp), expiry) AS dte
 FROM {database}.{table}
-WHERE timestamp >= '{start}'
-  AND timestamp < '{end}'
-  AND underlying = '{underlying}'
-GROUP BY ts, underlying
-ORDER BY ts
+WHERE timestamp >= {start}
+  AND timestamp < {end}
+  AND underlying = {underlying}
+ORDER BY ts, underlying, dte
+LIMIT 1 BY ts, underlying
 """
 
 ATM_FILTER_QUERY = """
@@ -73,6 +72,8 @@ WHERE strike / index_price BETWEEN {lower} AND {upper}
 
 LIQUIDITY_FILTER_QUERY = """
 -- Liquidity filter: contracts with daily volume above threshold
+-- Semi-join via IN (a set of qualifying keys) rather than a JOIN that would
+-- build a hash table over the wide base rows
 WITH base AS (
     {inner_query}
 ),
@@ -84,12 +85,42 @@ daily_volume AS (
     FROM base
     GROUP BY instrument_name, trade_date
 )
-SELECT b.*
-FROM base b
-INNER JOIN daily_volume dv
-    ON b.instrument_name = dv.instrument_name
-    AND toDate(b.ts) = dv.trade_date
-WHERE dv.total_volume >= {min_volume}
+SELECT *
+FROM base
+WHERE (instrument_name, toDate(ts)) IN (
+    SELECT instrument_name, trade_date
+    FROM daily_volume
+    WHERE total_volume >= {min_volume}
+)
+"""
+
+# Per-strategy row counts in one query: each filter is a countIf over one scan
+# of the front-month rows. Liquidity is measured on ATM rows, as in the
+# front_atm_liquid chain (ATM filter first, then daily volume); the daily
+# volume is a window sum over that same scan, because a CTE referenced twice
+# (e.g. again inside an IN subquery) is inlined and evaluated twice
+CONTRACT_STATS_QUERY = """
+-- Contract counts for every selection strategy
+WITH front AS (
+    {front_month_query}
+)
+SELECT
+    (
+        SELECT count()
+        FROM {database}.{table}
+        WHERE timestamp >= {start}
+          AND timestamp < {end}
+          AND underlying = {underlying}
+    ) AS all,
+    count() AS front_month,
+    countIf(is_atm) AS front_atm,
+    countIf(is_atm AND total_volume >= {min_volume}) AS front_atm_liquid
+FROM (
+    SELECT
+        strike / index_price BETWEEN {lower} AND {upper} AS is_atm,
+        sumIf(amount, is_atm) OVER (PARTITION BY instrument_name, toDate(ts)) AS total_volume
+    FROM front
+)
 """
 
 # Direct query for "all" strategy (no filtering)
@@ -105,15 +136,77 @@ SELECT
     price,
     amount,
     direction,
-    index_price
+    index_price,
+    dateDiff('day', toDate(timestamp), expiry) AS dte
 FROM {database}.{table}
-WHERE timestamp >= '{start}'
-  AND timestamp < '{end}'
-  AND underlying = '{underlying}'
+WHERE timestamp >= {start}
+  AND timestamp < {end}
+  AND underlying = {underlying}
 ORDER BY timestamp
 """
 
 
+# Executed selection queries are parameterized, so repeated refreshes share one
+# normalized query text and can be answered from the ClickHouse query cache
+QUERY_SETTINGS: dict[str, Any] = {"use_query_cache": 1}
+
+# Bound parameter placeholders ({name:Type}, clickhouse-connect server binding).
+# Time bounds are typed like the DateTime64(3) timestamp column: the value is
+# parsed once when bound, not coerced from a string per compared row
+_PARAMETER_PLACEHOLDERS: dict[str, str] = {
+    "start": "{start:DateTime64(3)}",
+    "end": "{end:DateTime64(3)}",
+    "underlying": "{underlying:String}",
+    "lower": "{lower:Float64}",
+    "upper": "{upper:Float64}",
+    "min_volume": "{min_volume:Float64}",
+}
+
+
+def build_query_parameters(
+    start: str = "2024-01-01",
+    end: str = "2024-12-31",
+    underlying: str = "BTC",
+    config: FeatureConfig = DEFAULT_CONFIG,
+) -> dict[str, Any]:
+    """
+    Values for the bound parameters of a parameterized selection query.
+
+    Args:
+        start: Start date (inclusive)
+        end: End date (exclusive)
+        underlying: Underlying asset ('BTC' or 'ETH')
+        config: FeatureConfig for ATM width and volume thresholds
+
+    Returns:
+        Dict to pass as ``parameters=`` to the ClickHouse client
+    """
+    return {
+        "start": start,
+        "end": end,
+        "underlying": underlying,
+        "lower": 1.0 - config.atm_width,
+        "upper": 1.0 + config.atm_width,
+        "min_volume": config.min_volume,
+    }
+
+
+def _filter_values(
+    start: str,
+    end: str,
+    underlying: str,
+    config: FeatureConfig,
+    parameterized: bool,
+) -> dict[str, Any]:
+    """Template values: bound-parameter placeholders or quoted literals."""
+    if parameterized:
+        return dict(_PARAMETER_PLACEHOLDERS)
+    values = build_query_parameters(start, end, underlying, config)
+    for key in ("start", "end", "underlying"):
+        values[key] = f"'{values[key]}'"
+    return values
+
+
 def build_contract_selection_query(
     strategy: ContractStrategy = "front_atm_liquid",
     start: str = "2024-01-01",
@@ -122,6 +215,7 @@ def build_contract_selection_query(
     database: str = "deribit",
     table: str = "options_trades",
     config: FeatureConfig = DEFAULT_CONFIG,
+    parameterized: bool = False,
 ) -> str:
     """
     Build ClickHouse SQL query for contract selection.
@@ -140,6 +234,10 @@ def build_contract_selection_query(
         database: ClickHouse database name
         table: ClickHouse table name
         config: FeatureConfig for ATM width and volume thresholds
+        parameterized: If True, filter values are {name:Type} placeholders to
+            bind with build_query_parameters() (stable text for the query
+            cache). If False, they are inlined as literals, for composing
+            into other queries.
 
     Returns:
         SQL query string to execute against ClickHouse
@@ -153,39 +251,39 @@ def build_contract_selection_query(
         ... )
         >>> # Execute: client.query(query)
     """
+    values = _filter_values(start, end, underlying, config, parameterized)
+
     if strategy == "all":
         return ALL_CONTRACTS_QUERY.format(
             database=database,
             table=table,
-            start=start,
-            end=end,
-            underlying=underlying,
+            start=values["start"],
+            end=values["end"],
+            underlying=values["underlying"],
         )
 
     # Start with front-month selection
     query = FRONT_MONTH_QUERY.format(
         database=database,
         table=table,
-        start=start,
-        end=end,
-        underlying=underlying,
+        start=values["start"],
+        end=values["end"],
+        underlying=values["underlying"],
     )
 
     # Add ATM filter if requested
     if "atm" in strategy:
-        lower = 1.0 - config.atm_width
-        upper = 1.0 + config.atm_width
         query = ATM_FILTER_QUERY.format(
             inner_query=query,
-            lower=lower,
-            upper=upper,
+            lower=values["lower"],
+            upper=values["upper"],
         )
 
     # Add liquidity filter if requested
     if "liquid" in strategy:
         query = LIQUIDITY_FILTER_QUERY.format(
             inner_query=query,
-            min_volume=config.min_volume,
+            min_volume=values["min_volume"],
         )
 
     return query
@@ -236,8 +334,6 @@ def select_contracts(
         ... )
         >>> print(f"Selected {len(df)} contracts")
     """
-    import pandas as pd
-
     query = build_contract_selection_query(
         strategy=strategy,
         start=start,
@@ -246,18 +342,56 @@ def select_contracts(
         database=database,
         table=table,
         config=config,
+        parameterized=True,
     )
 
-    # Execute query and convert to DataFrame
-    result = client.query(query)
-
-    # Build DataFrame from result
-    df = pd.DataFrame(
-        result.result_rows,
-        columns=result.column_names,
+    # Columnar transfer straight into a DataFrame (no per-row Python tuples)
+    return client.query_df(
+        query,
+        parameters=build_query_parameters(start, end, underlying, config),
+        settings=QUERY_SETTINGS,
     )
 
-    return df
+
+def build_contract_stats_query(
+    start: str = "2024-01-01",
+    end: str = "2024-12-31",
+    underlying: str = "BTC",
+    database: str = "deribit",
+    table: str = "options_trades",
+    config: FeatureConfig = DEFAULT_CONFIG,
+    parameterized: bool = False,
+) -> str:
+    """
+    Build a single ClickHouse query counting rows for every strategy.
+
+    Args:
+        start: Start date (inclusive)
+        end: End date (exclusive)
+        underlying: Underlying asset
+        database: ClickHouse database name
+        table: ClickHouse table name
+        config: FeatureConfig for ATM width and volume thresholds
+        parameterized: If True, use bound-parameter placeholders
+            (see build_contract_selection_query)
+
+    Returns:
+        SQL query returning one row with a count column per strategy
+    """
+    values = _filter_values(start, end, underlying, config, parameterized)
+    front_month_query = FRONT_MONTH_QUERY.format(
+        database=database,
+        table=table,
+        start=values["start"],
+        end=values["end"],
+        underlying=values["underlying"],
+    )
+    return CONTRACT_STATS_QUERY.format(
+        front_month_query=front_month_query,
+        database=database,
+        table=table,
+        **values,
+    )
 
 
 def get_contract_stats(
@@ -271,7 +405,10 @@ def get_contract_stats(
     """
     Get contract count statistics for each selection strategy.
 
-    Useful for understanding data density and filter effects.
+    Useful for understanding data density and filter effects. All four
+    counts come from one query (see build_contract_stats_query) that scans
+    the front-month selection once, plus a plain count over the raw range
+    for "all".
 
     Args:
         client: ClickHouse client instance
@@ -284,19 +421,17 @@ def get_contract_stats(
     Returns:
         Dict mapping strategy name to contract count
     """
-    stats: dict[str, int] = {}
-
-    for strategy in ["all", "front_month", "front_atm", "front_atm_liquid"]:
-        query = build_contract_selection_query(
-            strategy=strategy,  # type: ignore[arg-type]
-            start=start,
-            end=end,
-            underlying=underlying,
-            database=database,
-            table=table,
-        )
-        count_query = f"SELECT count() FROM ({query})"
-        result = client.query(count_query)
-        stats[strategy] = result.result_rows[0][0]
-
-    return stats
+    query = build_contract_stats_query(
+        start=start,
+        end=end,
+        underlying=underlying,
+        database=database,
+        table=table,
+        parameterized=True,
+    )
+    result = client.query(
+        query,
+        parameters=build_query_parameters(start, end, underlying),
+        settings=QUERY_SETTINGS,
+    )
+    return dict(zip(result.column_names, result.result_rows[0], strict=True))
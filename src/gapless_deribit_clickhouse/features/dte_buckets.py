@@ -4,12 +4,29 @@ DTE (Days-to-Expiry) Bucket Aggregations.
 
 Aggregates trade metrics by expiry tenor buckets. Useful for analyzing
 how trading activity and IV vary across the term structure.
+
+Two paths produce the same wide columns:
+- dte_bucket_agg_sql(): buckets and aggregates server-side in ClickHouse
+  (multiIf bucket assignment, one GROUP BY pass), so only the aggregated
+  rows cross the network. Preferred for data stored in ClickHouse.
+- dte_bucket_agg(): pandas path for DataFrames already in memory.
 """
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
 import pandas as pd
 
+from gapless_deribit_clickhouse.features.contract_selector import (
+    QUERY_SETTINGS,
+    build_query_parameters,
+)
+
+if TYPE_CHECKING:
+    from clickhouse_connect.driver import Client
+
 # Default DTE bucket definitions
 DEFAULT_DTE_BUCKETS: list[tuple[int, int]] = [
     (0, 7),      # Weekly / front-month
@@ -23,6 +40,245 @@ DEFAULT_DTE_BUCKETS: list[tuple[int, int]] = [
 # Default metrics to aggregate
 DEFAULT_METRICS: list[str] = ["iv", "amount", "price"]
 
+# Output columns per input metric (shared by the pandas and SQL paths)
+METRIC_COLUMNS: dict[str, list[str]] = {
+    "iv": ["iv_mean", "iv_std"],
+    "amount": ["volume", "trade_count"],
+    "price": ["price_mean"],
+}
+
+# pandas aggregations matching METRIC_COLUMNS
+_METRIC_AGGS: dict[str, list[str]] = {
+    "iv": ["mean", "std"],
+    "amount": ["sum", "count"],
+    "price": ["mean"],
+}
+
+# DTE bucket aggregation query (long format: one row per interval and bucket)
+# stddevSamp/count(amount) match pandas resample().std()/count() semantics;
+# aggregates skip NULL iv like the pandas dropna(). Filter values are quoted
+# literals or bound parameters, as in contract_selector
+DTE_BUCKET_AGGREGATION_QUERY = """
+-- DTE bucket aggregations (long format)
+SELECT
+    toStartOfInterval(timestamp, INTERVAL {interval_seconds} SECOND) AS ts,
+    multiIf({bucket_cases}, '') AS bucket,
+    avg(iv) AS iv_mean,
+    stddevSamp(iv) AS iv_std,
+    sum(amount) AS volume,
+    count(amount) AS trade_count,
+    avg(price) AS price_mean
+FROM {database}.{table}
+WHERE timestamp >= {start}
+  AND timestamp < {end}
+  AND underlying = {underlying}
+GROUP BY ts, bucket
+HAVING bucket != ''  -- DTE outside every bucket
+ORDER BY ts, bucket
+"""
+
+# Bound parameter placeholders ({name:Type}, clickhouse-connect server binding);
+# time bounds are typed DateTime64(3), as in contract_selector
+_PARAMETER_PLACEHOLDERS: dict[str, str] = {
+    "start": "{start:DateTime64(3)}",
+    "end": "{end:DateTime64(3)}",
+    "underlying": "{underlying:String}",
+}
+
+
+def _query_parameters(start: str, end: str, underlying: str) -> dict[str, Any]:
+    """Bound parameter values for a parameterized DTE bucket query."""
+    parameters = build_query_parameters(start, end, underlying)
+    return {key: parameters[key] for key in _PARAMETER_PLACEHOLDERS}
+
+
+def build_dte_bucket_query(
+    buckets: list[tuple[int, int]] | None = None,
+    freq: str = "15min",
+    underlying: str = "BTC",
+    start: str = "2024-01-01",
+    end: str = "2024-12-31",
+    database: str = "deribit",
+    table: str = "options_trades",
+    parameterized: bool = False,
+) -> str:
+    """
+    Build ClickHouse query for DTE bucket aggregations.
+
+    Args:
+        buckets: DTE bucket definitions as (min_dte, max_dte) tuples
+        freq: Aggregation frequency as a pandas offset (default: 15min)
+        underlying: Underlying asset ('BTC' or 'ETH')
+        start: Start date (inclusive), format 'YYYY-MM-DD'
+        end: End date (exclusive), format 'YYYY-MM-DD'
+        database: ClickHouse database name
+        table: ClickHouse table name
+        parameterized: If True, filter values are {name:Type} placeholders
+            (see build_contract_selection_query); if False, quoted literals
+
+    Returns:
+        SQL query returning (ts, bucket, iv_mean, iv_std, volume,
+        trade_count, price_mean) rows
+
+    Example:
+        >>> query = build_dte_bucket_query(start="2024-01-01", end="2024-03-01")
+        >>> # Execute: client.query(query)
+    """
+    if buckets is None:
+        buckets = DEFAULT_DTE_BUCKETS
+
+    interval_seconds = int(pd.Timedelta(freq).total_seconds())
+    if interval_seconds <= 0:
+        raise ValueError(f"Aggregation frequency must be positive: {freq}")
+
+    # Same DTE as the pandas path: expiry date minus the trade's calendar date
+    dte = "dateDiff('day', toDate(timestamp), expiry)"
+    bucket_cases = ", ".join(
+        f"{dte} BETWEEN {min_dte} AND {max_dte}, 'dte_{min_dte}_{max_dte}'"
+        for min_dte, max_dte in buckets
+    )
+
+    if parameterized:
+        values = dict(_PARAMETER_PLACEHOLDERS)
+    else:
+        values = {
+            key: f"'{value}'" for key, value in _query_parameters(start, end, underlying).items()
+        }
+
+    return DTE_BUCKET_AGGREGATION_QUERY.format(
+        interval_seconds=interval_seconds,
+        bucket_cases=bucket_cases,
+        database=database,
+        table=table,
+        **values,
+    )
+
+
+def dte_bucket_agg_sql(
+    client: Client,
+    buckets: list[tuple[int, int]] | None = None,
+    metrics: list[str] | None = None,
+    freq: str = "15min",
+    underlying: str = "BTC",
+    start: str = "2024-01-01",
+    end: str = "2024-12-31",
+    database: str = "deribit",
+    table: str = "options_trades",
+) -> pd.DataFrame:
+    """
+    Aggregate trade metrics by DTE bucket in ClickHouse.
+
+    Server-side counterpart of dte_bucket_agg(): returns the same
+    "{bucket}_{metric_agg}" columns, but only intervals that contain trades
+    (no empty resample bins).
+
+    Args:
+        client: ClickHouse client instance
+        buckets: DTE bucket definitions as (min_dte, max_dte) tuples
+        metrics: Metrics to keep (default: iv, amount, price)
+        freq: Aggregation frequency (default: 15min)
+        underlying: Underlying asset ('BTC' or 'ETH')
+        start: Start date (inclusive)
+        end: End date (exclusive)
+        database: ClickHouse database name
+        table: ClickHouse table name
+
+    Returns:
+        Wide DataFrame indexed by interval start
+
+    Raises:
+        ValueError: If no metric is recognized or the query returns no rows
+    """
+    if buckets is None:
+        buckets = DEFAULT_DTE_BUCKETS
+
+    if metrics is None:
+        metrics = DEFAULT_METRICS
+
+    value_columns = [col for m in metrics for col in METRIC_COLUMNS.get(m, [])]
+    if not value_columns:
+        raise ValueError(f"None of the requested metrics are supported: {metrics}")
+
+    query = build_dte_bucket_query(
+        buckets=buckets,
+        freq=freq,
+        underlying=underlying,
+        start=start,
+        end=end,
+        database=database,
+        table=table,
+        parameterized=True,
+    )
+    long_df = client.query_df(
+        query,
+        parameters=_query_parameters(start, end, underlying),
+        settings=QUERY_SETTINGS,
+    )
+    if long_df.empty:
+        raise ValueError("No data available for any bucket/metric combination")
+
+    long_df["ts"] = pd.to_datetime(long_df["ts"])
+    wide = long_df.pivot(index="ts", columns="bucket", values=value_columns)
+
+    # Bucket-major column order, as in dte_bucket_agg()
+    bucket_names = [f"dte_{min_dte}_{max_dte}" for min_dte, max_dte in buckets]
+    columns = [
+        (col, bucket)
+        for bucket in bucket_names
+        for col in value_columns
+        if (col, bucket) in wide.columns
+    ]
+    wide = wide[columns]
+    wide.columns = [f"{bucket}_{col}" for col, bucket in columns]
+    wide.index.name = None
+    return wide
+
+
+def _derive_dte(expiry: pd.Series, timestamp: pd.Series) -> pd.Series:
+    """
+    Days from each trade's calendar date to its expiry.
+
+    Tz-naive datetime64 columns (the ClickHouse fetch path) are handled as
+    int64 day counts; anything else goes through pd.to_datetime().
+    """
+    if (
+        isinstance(expiry.dtype, np.dtype)
+        and isinstance(timestamp.dtype, np.dtype)
+        and expiry.dtype.kind == "M"
+        and timestamp.dtype.kind == "M"
+        and not (expiry.isna().any() or timestamp.isna().any())
+    ):
+        # Whole days since epoch; flooring both sides equals subtracting the
+        # normalized timestamp and taking Timedelta.days
+        expiry_days = expiry.to_numpy().astype("datetime64[D]").view("i8")
+        trade_days = timestamp.to_numpy().astype("datetime64[D]").view("i8")
+        return pd.Series(expiry_days - trade_days, index=expiry.index)
+
+    return (pd.to_datetime(expiry) - pd.to_datetime(timestamp).dt.normalize()).dt.days
+
+
+def _assign_dte_buckets(dte: pd.Series, buckets: list[tuple[int, int]]) -> pd.Categorical:
+    """
+    Label each DTE with its bucket in one np.searchsorted pass.
+
+    Values outside every bucket (or NaN) get a missing label.
+
+    Raises:
+        ValueError: If buckets overlap
+    """
+    labels = [f"dte_{min_dte}_{max_dte}" for min_dte, max_dte in buckets]
+    order = np.argsort([min_dte for min_dte, _ in buckets], kind="stable")
+    mins = np.array([buckets[i][0] for i in order], dtype=float)
+    maxs = np.array([buckets[i][1] for i in order], dtype=float)
+    if np.any(mins[1:] <= maxs[:-1]):
+        raise ValueError(f"DTE buckets must not overlap: {buckets}")
+
+    values = dte.to_numpy(dtype=float)
+    pos = np.clip(np.searchsorted(mins, values, side="right") - 1, 0, None)
+    inside = (values >= mins[pos]) & (values <= maxs[pos])
+    codes = np.where(inside, order[pos], -1)
+    return pd.Categorical.from_codes(codes, categories=labels)
+
 
 def dte_bucket_agg(
     df: pd.DataFrame,
@@ -36,7 +292,8 @@ def dte_bucket_agg(
     Aggregate trade metrics by DTE bucket.
 
     Groups trades into tenor buckets and computes aggregated statistics
-    for each bucket at the specified frequency.
+    for each bucket at the specified frequency. For data that lives in
+    ClickHouse, prefer dte_bucket_agg_sql(), which aggregates server-side.
 
     Args:
         df: DataFrame with trade data
@@ -51,7 +308,7 @@ def dte_bucket_agg(
         DataFrame with multi-level columns: (bucket, metric_agg)
 
     Raises:
-        ValueError: If required columns missing or no data
+        ValueError: If required columns missing, buckets overlap, or no data
     """
     if df.empty:
         raise ValueError("Cannot aggregate empty DataFrame")
@@ -62,19 +319,19 @@ def dte_bucket_agg(
     if metrics is None:
         metrics = DEFAULT_METRICS
 
-    df = df.copy()
+    # The input is never copied: derived columns go through assign() and the
+    # bucket labels are a separate grouping key
+    derived: dict[str, pd.Series] = {}
 
     # Compute DTE if not present
     if dte_col not in df.columns:
         if "expiry" not in df.columns or timestamp_col not in df.columns:
             raise ValueError(f"Missing {dte_col} column and cannot derive")
-        df[dte_col] = (
-            pd.to_datetime(df["expiry"]) - pd.to_datetime(df[timestamp_col]).dt.normalize()
-        ).dt.days
+        derived[dte_col] = _derive_dte(df["expiry"], df[timestamp_col])
 
     # Validate columns
     required = {timestamp_col, dte_col}
-    missing = required - set(df.columns)
+    missing = required - set(df.columns) - set(derived)
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
 
@@ -85,42 +342,52 @@ def dte_bucket_agg(
 
     # Ensure datetime
     if not pd.api.types.is_datetime64_any_dtype(df[timestamp_col]):
-        df[timestamp_col] = pd.to_datetime(df[timestamp_col])
+        derived[timestamp_col] = pd.to_datetime(df[timestamp_col])
 
-    df = df.set_index(timestamp_col)
+    if derived:
+        df = df.assign(**derived)
+    bucket = _assign_dte_buckets(df[dte_col], buckets)
+
+    # One group-aggregate pass over (interval, bucket) for every metric, plus
+    # a non-null count per metric that marks the bins it has values in
+    agg_spec = {}
+    for metric in available_metrics:
+        if metric not in METRIC_COLUMNS:
+            continue
+        for col, agg in zip(METRIC_COLUMNS[metric], _METRIC_AGGS[metric], strict=True):
+            agg_spec[col] = (metric, agg)
+        agg_spec[f"_{metric}_count"] = (metric, "count")
+    if not agg_spec:
+        raise ValueError("No data available for any bucket/metric combination")
+    keys = [pd.Grouper(key=timestamp_col, freq=freq), bucket]
+    grouped = df.groupby(keys, observed=True).agg(**agg_spec)
+    wide = grouped.unstack(-1)
+    non_null = df[available_metrics].groupby(bucket, observed=True).count()
 
     all_results = {}
 
     for min_dte, max_dte in buckets:
         bucket_name = f"dte_{min_dte}_{max_dte}"
-        bucket_df = df[(df[dte_col] >= min_dte) & (df[dte_col] <= max_dte)]
-
-        if bucket_df.empty:
+        if bucket_name not in non_null.index:
             continue
 
-        # Aggregate each metric
         for metric in available_metrics:
-            if metric not in bucket_df.columns:
+            if metric not in METRIC_COLUMNS or non_null.at[bucket_name, metric] == 0:
                 continue
 
-            metric_data = bucket_df[metric].dropna()
-            if metric_data.empty:
-                continue
+            # Like resample() on the metric's non-null values, the output spans
+            # its first..last bin, with empty bins in between (sums/counts 0)
+            present = wide[(f"_{metric}_count", bucket_name)] > 0
+            span = pd.date_range(present.idxmax(), present[::-1].idxmax(), freq=freq)
 
-            resampled = metric_data.resample(freq)
-
-            # Different aggregations based on metric type
-            if metric == "iv":
-                # For IV: mean and std
-                all_results[f"{bucket_name}_iv_mean"] = resampled.mean()
-                all_results[f"{bucket_name}_iv_std"] = resampled.std()
-            elif metric == "amount":
-                # For volume: sum and count
-                all_results[f"{bucket_name}_volume"] = resampled.sum()
-                all_results[f"{bucket_name}_trade_count"] = resampled.count()
-            elif metric == "price":
-                # For price: VWAP-style mean
-                all_results[f"{bucket_name}_price_mean"] = resampled.mean()
+            for col in METRIC_COLUMNS[metric]:
+                series = wide[(col, bucket_name)].reindex(span)
+                if col == "volume":
+                    series = series.fillna(0)
+                elif col == "trade_count":
+                    series = series.fillna(0).astype("int64")
+                series.index.name = timestamp_col
+                all_results[f"{bucket_name}_{col}"] = series
 
     if not all_results:
         raise ValueError("No data available for any bucket/metric combination")
@@ -159,34 +426,46 @@ def dte_distribution(
     if buckets is None:
         buckets = DEFAULT_DTE_BUCKETS
 
-    df = df.copy()
+    # As in dte_bucket_agg(), derived columns go through assign() (no copy)
+    derived: dict[str, pd.Series] = {}
 
     # Compute DTE if needed
     if dte_col not in df.columns:
         if "expiry" not in df.columns or timestamp_col not in df.columns:
             raise ValueError(f"Missing {dte_col} column")
-        df[dte_col] = (
-            pd.to_datetime(df["expiry"]) - pd.to_datetime(df[timestamp_col]).dt.normalize()
-        ).dt.days
+        derived[dte_col] = _derive_dte(df["expiry"], df[timestamp_col])
 
     if not pd.api.types.is_datetime64_any_dtype(df[timestamp_col]):
-        df[timestamp_col] = pd.to_datetime(df[timestamp_col])
-
-    df = df.set_index(timestamp_col)
+        derived[timestamp_col] = pd.to_datetime(df[timestamp_col])
 
-    bucket_volumes = {}
-
-    for min_dte, max_dte in buckets:
-        bucket_name = f"dte_{min_dte}_{max_dte}_pct"
-        bucket_df = df[(df[dte_col] >= min_dte) & (df[dte_col] <= max_dte)]
-
-        if not bucket_df.empty and amount_col in bucket_df.columns:
-            bucket_volumes[bucket_name] = bucket_df[amount_col].resample(freq).sum()
+    if amount_col not in df.columns:
+        raise ValueError("No volume data for any bucket")
 
-    if not bucket_volumes:
+    if derived:
+        df = df.assign(**derived)
+    bucket = _assign_dte_buckets(df[dte_col], buckets)
+
+    # One groupby for every bucket's per-interval volume
+    volumes = (
+        df.groupby([pd.Grouper(key=timestamp_col, freq=freq), bucket], observed=True)[amount_col]
+        .sum()
+        .unstack(-1)
+    )
+    if volumes.empty:
         raise ValueError("No volume data for any bucket")
 
-    result_df = pd.DataFrame(bucket_volumes).fillna(0)
+    # Keep resample()'s row set: each bucket spans its first..last bin
+    volumes = volumes.reindex(
+        pd.date_range(volumes.index.min(), volumes.index.max(), freq=freq, name=timestamp_col)
+    )
+    present = volumes.notna()
+    in_span = (present.cumsum() > 0) & (present[::-1].cumsum()[::-1] > 0)
+    volumes = volumes[in_span.any(axis=1)]
+
+    labels = [f"dte_{min_dte}_{max_dte}" for min_dte, max_dte in buckets]
+    ordered = [label for label in labels if label in volumes.columns]
+    result_df = volumes[ordered].fillna(0)
+    result_df.columns = [f"{label}_pct" for label in ordered]
 
     # Convert to percentages
     row_totals = result_df.sum(axis=1)
@@ -14,8 +14,15 @@ Configuration (from ADR research):
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Literal
-
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
 import pandas as pd
 
 if TYPE_CHECKING:
@@ -32,6 +39,42 @@ DEFAULT_DIST = "t"  # Student's t distribution for fat tails
 # Minimum observations for reliable estimation
 MIN_OBSERVATIONS = 100
 
+# LRU cache of fitted models keyed by series content and model spec, so
+# repeated grid searches / refreshes on the same data skip the optimizer.
+# Entries are deep-copied in and out: callers may annotate their result
+FIT_CACHE_SIZE = 64
+_fit_cache: OrderedDict[tuple[Any, ...], ARCHModelResult] = OrderedDict()
+_fit_cache_lock = threading.Lock()
+
+
+def _fit_cache_key(
+    iv_series: pd.Series, p: int, o: int, q: int, dist: str, rescale: bool
+) -> tuple[Any, ...]:
+    """Content-address a (NaN-free) series and model spec."""
+    content = pd.util.hash_pandas_object(iv_series, index=True).to_numpy().tobytes()
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    return (digest, len(iv_series), p, o, q, dist, rescale)
+
+
+def _fit_cache_get(key: tuple[Any, ...]) -> ARCHModelResult | None:
+    """Return a private copy of a cached fit, or None."""
+    with _fit_cache_lock:
+        result = _fit_cache.get(key)
+        if result is None:
+            return None
+        _fit_cache.move_to_end(key)
+    return copy.deepcopy(result)
+
+
+def _fit_cache_put(key: tuple[Any, ...], result: ARCHModelResult) -> None:
+    """Store a copy of a fit, evicting the least recently used entries."""
+    result = copy.deepcopy(result)
+    with _fit_cache_lock:
+        _fit_cache[key] = result
+        _fit_cache.move_to_end(key)
+        while len(_fit_cache) > FIT_CACHE_SIZE:
+            _fit_cache.popitem(last=False)
+
 
 def fit_egarch(
     iv_series: pd.Series,
@@ -90,16 +133,21 @@ def fit_egarch(
 
     # Check for regular time series
     if isinstance(iv_series.index, pd.DatetimeIndex):
-        time_diffs = iv_series.index.to_series().diff().dropna()
-        unique_diffs = time_diffs.unique()
+        # Distinct spacings on the int64 ticks (no Timedelta objects)
+        unique_diffs = np.unique(np.diff(iv_series.index.asi8))
 
         # Allow small tolerance for floating point
-        if len(unique_diffs) > 3:  # More than 3 unique intervals suggests irregular
+        if unique_diffs.size > 3:  # More than 3 unique intervals suggests irregular
             raise ValueError(
                 "IV series appears irregular. Use resample_iv() first to create "
                 "regular time series. EGARCH requires fixed-interval data."
             )
 
+    cache_key = _fit_cache_key(iv_series, p, o, q, dist, rescale)
+    cached = _fit_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     # Rescale for numerical stability (arch recommends this)
     if rescale:
         scale_factor = iv_series.std()
@@ -127,15 +175,31 @@ def fit_egarch(
     else:
         result._scale_factor = 1.0  # type: ignore[attr-defined]
 
+    _fit_cache_put(cache_key, result)
     return result
 
 
+def _safe_fit(
+    iv_series: pd.Series,
+    p: int,
+    o: int,
+    q: int,
+    dist: str,
+) -> tuple[int, int, ARCHModelResult | None]:
+    """Fit one grid point, returning None when it fails to converge."""
+    try:
+        return p, q, fit_egarch(iv_series, p=p, o=o, q=q, dist=dist)
+    except (ValueError, RuntimeError):
+        return p, q, None
+
+
 def auto_select_egarch(
     iv_series: pd.Series,
     p_range: tuple[int, int] = (1, 2),
     q_range: tuple[int, int] = (1, 2),
     criterion: Literal["aic", "bic"] = "aic",
     config: FeatureConfig = DEFAULT_CONFIG,
+    n_jobs: int | None = 1,
 ) -> ARCHModelResult:
     """
     Auto-select EGARCH order using information criteria grid search.
@@ -147,12 +211,22 @@ def auto_select_egarch(
     The asymmetry order (o) is fixed at 1 as this is the standard EGARCH
     specification that captures the leverage effect.
 
+    Grid points are independent CPU-bound fits, so they run in parallel
+    worker processes (results come back pickled). Points already in the
+    fit cache are not refitted. Ties keep the first (p, q) in grid order,
+    as a serial search would.
+
     Args:
         iv_series: Resampled IV (MUST be regular time series)
         p_range: (min_p, max_p) for ARCH order search (default: (1, 2))
         q_range: (min_q, max_q) for GARCH order search (default: (1, 2))
         criterion: Selection criterion - 'aic' or 'bic' (default: 'aic')
         config: FeatureConfig for distribution and other parameters
+        n_jobs: Worker processes (default 1: fit serially in this process).
+                Opt-in parallelism uses a ProcessPoolExecutor, so callers
+                must guard their entry point with ``if __name__ ==
+                "__main__":`` under spawn/forkserver start methods; None
+                uses one per grid point, capped at the CPU count
 
     Returns:
         Best fitted ARCHModelResult based on criterion
@@ -168,30 +242,57 @@ def auto_select_egarch(
         >>> print(f"Selected: EGARCH({best_model.model.p}, 1, {best_model.model.q})")
         >>> print(f"AIC: {best_model.aic:.2f}")
     """
+    grid = [
+        (p, q)
+        for p in range(p_range[0], p_range[1] + 1)
+        for q in range(q_range[0], q_range[1] + 1)
+    ]
+    # Grid points already fitted on this data come from the fit cache; only
+    # the misses are dispatched (worker processes have their own caches)
+    clean = iv_series.dropna()
+    keys = {
+        (p, q): _fit_cache_key(clean, p, config.egarch_o, q, config.egarch_dist, True)
+        for p, q in grid
+    }
+    fitted = {point: _fit_cache_get(key) for point, key in keys.items()}
+    missing = [point for point in grid if fitted[point] is None]
+
+    if n_jobs is None:
+        n_jobs = min(len(missing), os.cpu_count() or 1)
+    if n_jobs > 1:
+        # Copy once so each task pickles a plain series, not a view of a frame
+        iv_series = iv_series.copy()
+    fit_args = (
+        [iv_series] * len(missing),
+        [p for p, _ in missing],
+        [config.egarch_o] * len(missing),  # Asymmetry order fixed
+        [q for _, q in missing],
+        [config.egarch_dist] * len(missing),
+    )
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            for p, q, result in executor.map(_safe_fit, *fit_args):
+                fitted[(p, q)] = result
+                if result is not None:
+                    _fit_cache_put(keys[(p, q)], result)
+    else:
+        for p, q, result in map(_safe_fit, *fit_args):
+            fitted[(p, q)] = result
+
     best_result: ARCHModelResult | None = None
     best_score = float("inf")
     best_params: tuple[int, int] | None = None
 
-    for p in range(p_range[0], p_range[1] + 1):
-        for q in range(q_range[0], q_range[1] + 1):
-            try:
-                result = fit_egarch(
-                    iv_series,
-                    p=p,
-                    o=config.egarch_o,  # Asymmetry order fixed
-                    q=q,
-                    dist=config.egarch_dist,
-                )
-                score = result.aic if criterion == "aic" else result.bic
-
-                if score < best_score:
-                    best_score = score
-                    best_result = result
-                    best_params = (p, q)
-
-            except (ValueError, RuntimeError):
-                # Skip combinations that fail to converge
-                continue
+    for p, q in grid:
+        result = fitted[(p, q)]
+        if result is None:
+            # Skip combinations that fail to converge
+            continue
+        score = result.aic if criterion == "aic" else result.bic
+        if score < best_score:
+            best_score = score
+            best_result = result
+            best_params = (p, q)
 
     if best_result is None:
         raise ValueError(
@@ -92,6 +92,17 @@ def get_capabilities() -> list[Capability]:
                 "limit": "Maximum rows",
             },
         ),
+        Capability(
+            name="Stream Historical Trades",
+            function="gapless_deribit_clickhouse.iter_trades()",
+            description="Stream trades as Arrow record batches (bounded memory, needs pyarrow)",
+            example='for batch in iter_trades(underlying="BTC", start="2024-01-01"): ...',
+            parameters={
+                "filters": "Same as fetch_trades",
+                "columns": "Columns to select (default: all)",
+                "as_pandas": "Yield DataFrames instead of RecordBatches",
+            },
+        ),
         Capability(
             name="Collect Trades",
             function="gapless_deribit_clickhouse.collect_trades()",
@@ -151,6 +162,7 @@ Data Sources:
 
 Key Capabilities:
   - fetch_trades(): Query historical trade data
+  - iter_trades(): Stream historical trades in Arrow record batches
   - collect_trades(): Collect trades from Deribit API to ClickHouse
 
 Instrument Format: {UNDERLYING}-{DDMMMYY}-{STRIKE}-{C|P}
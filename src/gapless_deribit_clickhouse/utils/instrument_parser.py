@@ -11,6 +11,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from datetime import date
+from functools import lru_cache
 from typing import Literal
 
 from gapless_deribit_clickhouse.exceptions import InstrumentParseError
@@ -24,6 +25,10 @@ INSTRUMENT_PATTERN = re.compile(
     r"(?P<option_type>[CP])$"
 )
 
+# Distinct instruments over a full backfill are in the low thousands, while trades
+# number in the millions: cache parses so each name is parsed once
+PARSE_CACHE_SIZE = 65536
+
 # Month abbreviations used by Deribit
 MONTH_MAP = {
     "JAN": 1,
@@ -96,10 +101,14 @@ def parse_expiry(expiry_str: str) -> date:
         raise InstrumentParseError(f"Invalid date {expiry_str}: {e}") from e
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def parse_instrument(instrument_name: str) -> ParsedInstrument:
     """
     Parse a Deribit instrument name into components.
 
+    Results are memoized (ParsedInstrument is immutable); invalid names are
+    not cached and raise on every call.
+
     Args:
         instrument_name: Full instrument name (e.g., "BTC-27DEC24-100000-C")
 
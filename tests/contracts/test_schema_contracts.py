@@ -62,6 +62,34 @@ class TestSchemaContracts:
         for col in schema.columns:
             assert col.pandas_dtype, f"Column {col.name} missing x-pandas.dtype"
 
+    def test_api_column_allowlist_matches_schema(self):
+        """fetch_trades(columns=...) allowlist must track the YAML columns."""
+        from gapless_deribit_clickhouse.api import TRADES_COLUMNS
+
+        schema = load_schema("options_trades")
+        assert {c.name for c in schema.columns} == TRADES_COLUMNS
+
+    def test_api_filter_domains_match_schema_enums(self):
+        """fetch_trades filter validation must accept exactly the YAML enum values."""
+        from gapless_deribit_clickhouse.api import VALID_OPTION_TYPES, VALID_UNDERLYINGS
+
+        schema = load_schema("options_trades")
+        enums = {c.name: set(c.enum_values or ()) for c in schema.columns}
+        assert enums["underlying"] == VALID_UNDERLYINGS
+        assert enums["option_type"] == VALID_OPTION_TYPES
+
+    def test_api_categoricals_match_schema(self):
+        """Columns fetched as categoricals are the x-pandas "category" enums."""
+        from gapless_deribit_clickhouse.api import _TRADES_CATEGORIES
+
+        schema = load_schema("options_trades")
+        categorical = {
+            c.name: tuple(sorted(c.enum_values or ()))
+            for c in schema.columns
+            if c.pandas_dtype == "category"
+        }
+        assert categorical == {name: tuple(sorted(v)) for name, v in _TRADES_CATEGORIES.items()}
+
 
 class TestInstrumentParsingContracts:
     """Validate instrument parsing roundtrip invariants."""
@@ -116,3 +144,10 @@ class TestAPIContracts:
         for exc in expected:
             assert hasattr(gdch, exc), f"Missing exception: {exc}"
             assert issubclass(getattr(gdch, exc), Exception)
+
+    def test_all_exports_resolve(self):
+        """Every name in __all__ resolves (lazy exports included)."""
+        import gapless_deribit_clickhouse as gdch
+
+        for name in gdch.__all__:
+            assert getattr(gdch, name) is not None, f"Unresolvable export: {name}"
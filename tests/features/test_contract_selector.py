@@ -9,6 +9,7 @@ Integration tests requiring ClickHouse are marked with @pytest.mark.e2e.
 from gapless_deribit_clickhouse.features.config import FeatureConfig
 from gapless_deribit_clickhouse.features.contract_selector import (
     build_contract_selection_query,
+    build_query_parameters,
 )
 
 
@@ -32,8 +33,8 @@ class TestBuildContractSelectionQuery:
         # Should NOT have argMin (no front-month selection)
         assert "argMin" not in query
 
-    def test_front_month_uses_argmin(self) -> None:
-        """Test front_month strategy uses argMin pattern."""
+    def test_front_month_uses_limit_by(self) -> None:
+        """Test front_month strategy uses the LIMIT 1 BY pattern."""
         query = build_contract_selection_query(
             strategy="front_month",
             start="2024-01-01",
@@ -41,8 +42,11 @@ class TestBuildContractSelectionQuery:
             underlying="BTC",
         )
 
-        # Should use argMin for efficient front-month selection
-        assert "argMin" in query
+        # Nearest expiry per bucket via LIMIT 1 BY (no tuple aggregate state)
+        assert "LIMIT 1 BY ts, underlying" in query
+        assert "argMin" not in query
+        # DTE is materialized server-side for downstream bucketing
+        assert "AS dte" in query
         assert "dateDiff" in query
         assert "toStartOfFifteenMinutes" in query
 
@@ -74,6 +78,9 @@ class TestBuildContractSelectionQuery:
         # Should have volume filter
         assert "total_volume" in query
         assert ">=" in query
+        # Semi-join on the qualifying (instrument, day) set, no self-join
+        assert "(instrument_name, toDate(ts)) IN (" in query
+        assert "INNER JOIN" not in query
         # Default min_volume is 10.0
         assert "10.0" in query
 
@@ -132,6 +139,99 @@ class TestBuildContractSelectionQuery:
         assert "custom_db.custom_table" in query
 
 
+class TestSelectContracts:
+    """Test contract selection execution against a stub client."""
+
+    def test_fetches_dataframe_columnar(self) -> None:
+        """Test results come from query_df rather than row tuples."""
+        import pandas as pd
+
+        from gapless_deribit_clickhouse.features.contract_selector import select_contracts
+
+        expected = pd.DataFrame({"instrument_name": ["BTC-27DEC24-100000-C"]})
+
+        class StubClient:
+            def __init__(self) -> None:
+                self.calls: list[tuple[str, dict, dict]] = []
+
+            def query_df(self, query: str, parameters: dict, settings: dict) -> pd.DataFrame:
+                self.calls.append((query, parameters, settings))
+                return expected
+
+        client = StubClient()
+        df = select_contracts(client, strategy="front_month", underlying="ETH")  # type: ignore[arg-type]
+
+        assert df is expected
+        [(query, parameters, settings)] = client.calls
+        assert "LIMIT 1 BY" in query
+        # Values are bound server-side; the query text stays cacheable
+        assert "underlying = {underlying:String}" in query
+        assert "timestamp >= {start:DateTime64(3)}" in query
+        assert "ETH" not in query
+        # build_query_parameters supplies a value for every typed placeholder
+        assert parameters == build_query_parameters("2024-01-01", "2024-12-31", "ETH")
+        assert settings == {"use_query_cache": 1}
+
+    def test_parameterized_query_has_no_literals(self) -> None:
+        """Test every filter value becomes a typed placeholder."""
+        query = build_contract_selection_query(
+            strategy="front_atm_liquid",
+            start="2024-01-01",
+            underlying="BTC",
+            parameterized=True,
+        )
+
+        for placeholder in (
+            "{start:DateTime64(3)}",
+            "{end:DateTime64(3)}",
+            "{underlying:String}",
+            "{lower:Float64}",
+            "{upper:Float64}",
+            "{min_volume:Float64}",
+        ):
+            assert placeholder in query
+        assert "2024-01-01" not in query
+        assert "'BTC'" not in query
+
+
+class TestContractStats:
+    """Test single-query contract statistics."""
+
+    def test_stats_query_counts_every_strategy(self) -> None:
+        """Test one query yields a count column per strategy."""
+        from gapless_deribit_clickhouse.features.contract_selector import (
+            build_contract_stats_query,
+        )
+
+        query = build_contract_stats_query(start="2024-01-01", end="2024-06-01")
+
+        for alias in ("AS all", "AS front_month", "AS front_atm", "AS front_atm_liquid"):
+            assert alias in query
+        assert query.count("LIMIT 1 BY ts, underlying") == 1
+        # front is read by one scan only: a second reference would re-run it
+        assert query.count("FROM front") == 1
+        assert "OVER (PARTITION BY instrument_name, toDate(ts))" in query
+        assert "total_volume >= 10.0" in query
+
+    def test_get_contract_stats_runs_one_query(self) -> None:
+        """Test stats are read from a single result row."""
+        from types import SimpleNamespace
+
+        from gapless_deribit_clickhouse.features.contract_selector import get_contract_stats
+
+        queries: list[str] = []
+        columns = ["all", "front_month", "front_atm", "front_atm_liquid"]
+
+        def query(sql: str, parameters: dict, settings: dict) -> SimpleNamespace:
+            queries.append(sql)
+            return SimpleNamespace(column_names=columns, result_rows=[(100, 40, 12, 5)])
+
+        stats = get_contract_stats(SimpleNamespace(query=query))  # type: ignore[arg-type]
+
+        assert stats == {"all": 100, "front_month": 40, "front_atm": 12, "front_atm_liquid": 5}
+        assert len(queries) == 1
+
+
 class TestSpotProviderQueries:
     """Test SQL query generation for spot price enrichment."""
 
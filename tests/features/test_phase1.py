@@ -310,6 +310,124 @@ class TestDTEBucketAgg:
         with pytest.raises(ValueError, match="empty"):
             dte_bucket_agg(empty_df)
 
+    def test_bucket_agg_fills_empty_bins_like_resample(self) -> None:
+        """Test empty intervals inside a bucket's span get zero volume."""
+        from gapless_deribit_clickhouse.features import dte_bucket_agg
+
+        df = pd.DataFrame({
+            "timestamp": pd.to_datetime(
+                ["2024-01-01 00:00", "2024-01-01 00:05", "2024-01-01 00:40"]
+            ),
+            "dte": [3, 200, 5],  # 200 falls outside every custom bucket
+            "amount": [1.0, 9.0, 2.0],
+        })
+
+        result = dte_bucket_agg(df, buckets=[(0, 7), (8, 14)], metrics=["amount"])
+
+        assert list(result.columns) == ["dte_0_7_volume", "dte_0_7_trade_count"]
+        assert result["dte_0_7_volume"].tolist() == [1.0, 0.0, 2.0]
+        assert result["dte_0_7_trade_count"].tolist() == [1, 0, 1]
+
+    def test_bucket_agg_leaves_input_untouched(self, multi_dte_df: pd.DataFrame) -> None:
+        """Test derived DTE/bucket columns never land on the caller's frame."""
+        from gapless_deribit_clickhouse.features import dte_bucket_agg
+
+        before = multi_dte_df.copy()
+
+        dte_bucket_agg(multi_dte_df)
+
+        pd.testing.assert_frame_equal(multi_dte_df, before)
+
+    def test_bucket_agg_overlapping_buckets_raise(self, multi_dte_df: pd.DataFrame) -> None:
+        """Test overlapping bucket definitions are rejected."""
+        from gapless_deribit_clickhouse.features import dte_bucket_agg
+
+        with pytest.raises(ValueError, match="overlap"):
+            dte_bucket_agg(multi_dte_df, buckets=[(0, 10), (7, 14)])
+
+    def test_derive_dte_fast_path_matches_parsing(self) -> None:
+        """Test int64 day arithmetic matches the to_datetime/normalize path."""
+        from gapless_deribit_clickhouse.features.dte_buckets import _derive_dte
+
+        timestamps = pd.Series(pd.to_datetime(["2024-12-01 23:59", "2024-12-06 00:00"]))
+        expiries = pd.Series(pd.to_datetime(["2024-12-06 08:00", "2024-12-06 08:00"]))
+
+        fast = _derive_dte(expiries, timestamps)
+        parsed = _derive_dte(expiries.astype(str), timestamps.astype(str))
+
+        assert fast.tolist() == parsed.tolist() == [5, 0]
+
+    def test_dte_distribution_percentages(self) -> None:
+        """Test volume shares per interval, with empty intervals left undefined."""
+        from gapless_deribit_clickhouse.features.dte_buckets import dte_distribution
+
+        df = pd.DataFrame({
+            "timestamp": pd.to_datetime(
+                ["2024-01-01 00:00", "2024-01-01 00:00", "2024-01-01 00:30"]
+            ),
+            "dte": [3, 10, 5],
+            "amount": [1.0, 3.0, 2.0],
+        })
+
+        result = dte_distribution(df, buckets=[(0, 7), (8, 14), (15, 30)])
+
+        assert list(result.columns) == ["dte_0_7_pct", "dte_8_14_pct"]
+        assert result.iloc[0].tolist() == [25.0, 75.0]
+        assert result.iloc[1].isna().all()
+        assert result.iloc[2].tolist() == [100.0, 0.0]
+
+    def test_bucket_query_aggregates_server_side(self) -> None:
+        """Test SQL path assigns buckets with multiIf and groups per interval."""
+        from gapless_deribit_clickhouse.features import build_dte_bucket_query
+
+        query = build_dte_bucket_query(buckets=[(0, 7), (8, 14)], freq="15min")
+
+        assert "INTERVAL 900 SECOND" in query
+        assert "multiIf(" in query
+        assert "BETWEEN 8 AND 14, 'dte_8_14'" in query
+        assert "GROUP BY ts, bucket" in query
+        assert "underlying = 'BTC'" in query
+
+    def test_bucket_agg_sql_pivots_to_wide_columns(self) -> None:
+        """Test SQL path returns the same column names as the pandas path."""
+        from types import SimpleNamespace
+
+        from gapless_deribit_clickhouse.features import dte_bucket_agg_sql
+
+        columns = ["ts", "bucket", "iv_mean", "iv_std", "volume", "trade_count", "price_mean"]
+        rows = [
+            ("2024-01-01 00:00:00", "dte_8_14", 0.6, 0.02, 3.0, 2, 0.04),
+            ("2024-01-01 00:00:00", "dte_0_7", 0.5, 0.01, 1.0, 1, 0.02),
+            ("2024-01-01 00:15:00", "dte_0_7", 0.55, None, 2.0, 1, 0.03),
+        ]
+        calls: list[tuple[str, dict, dict]] = []
+
+        def query_df(query: str, parameters: dict, settings: dict) -> pd.DataFrame:
+            calls.append((query, parameters, settings))
+            return pd.DataFrame(rows, columns=columns)
+
+        client = SimpleNamespace(query_df=query_df)
+
+        result = dte_bucket_agg_sql(client, buckets=[(0, 7), (8, 14)], metrics=["iv"])
+
+        # Filters are bound server-side, as in select_contracts
+        [(query, parameters, settings)] = calls
+        assert "underlying = {underlying:String}" in query
+        assert "timestamp >= {start:DateTime64(3)}" in query
+        assert "timestamp < {end:DateTime64(3)}" in query
+        assert "2024-01-01" not in query
+        assert parameters == {"start": "2024-01-01", "end": "2024-12-31", "underlying": "BTC"}
+        assert settings == {"use_query_cache": 1}
+
+        assert list(result.columns) == [
+            "dte_0_7_iv_mean",
+            "dte_0_7_iv_std",
+            "dte_8_14_iv_mean",
+            "dte_8_14_iv_std",
+        ]
+        assert len(result) == 2
+        assert result["dte_0_7_iv_mean"].iloc[1] == 0.55
+
 
 # === pcr_by_tenor Tests ===
 
@@ -473,6 +591,61 @@ class TestEGARCH:
         assert result._auto_selected is True  # type: ignore[attr-defined]
         assert hasattr(result, "_selection_criterion")
 
+    def test_auto_select_egarch_parallel_matches_serial(
+        self, regular_iv_series: pd.Series, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test parallel grid search selects the same model as a serial one."""
+        from collections import OrderedDict
+
+        from gapless_deribit_clickhouse.features import auto_select_egarch, egarch
+
+        monkeypatch.setattr(egarch, "_fit_cache", OrderedDict())
+        serial = auto_select_egarch(regular_iv_series, n_jobs=1)
+        egarch._fit_cache.clear()  # Force the parallel search to refit
+        parallel = auto_select_egarch(regular_iv_series, n_jobs=2)
+
+        assert parallel._selected_params == serial._selected_params  # type: ignore[attr-defined]
+        assert parallel.aic == pytest.approx(serial.aic)
+
+    def test_auto_select_egarch_defaults_to_serial(
+        self, regular_iv_series: pd.Series, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the default grid search never starts worker processes."""
+        from collections import OrderedDict
+
+        from gapless_deribit_clickhouse.features import auto_select_egarch, egarch
+
+        def _no_pool(*args: object, **kwargs: object) -> None:
+            raise AssertionError("process pool started without n_jobs")
+
+        monkeypatch.setattr(egarch, "_fit_cache", OrderedDict())
+        monkeypatch.setattr(egarch, "ProcessPoolExecutor", _no_pool)
+
+        assert auto_select_egarch(regular_iv_series) is not None
+
+    def test_fit_egarch_reuses_cached_fit(
+        self, regular_iv_series: pd.Series, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test refits on identical data are served as private copies from the cache."""
+        from collections import OrderedDict
+
+        from gapless_deribit_clickhouse.features import egarch
+
+        monkeypatch.setattr(egarch, "_fit_cache", OrderedDict())
+        first = egarch.fit_egarch(regular_iv_series)
+        first._auto_selected = True  # type: ignore[attr-defined]
+
+        def _no_refit(*args: object, **kwargs: object) -> None:
+            raise AssertionError("cache miss")
+
+        monkeypatch.setattr("arch.arch_model", _no_refit)
+        second = egarch.fit_egarch(regular_iv_series.copy())
+
+        assert second is not first
+        assert second.aic == first.aic
+        assert not hasattr(second, "_auto_selected")
+        assert len(egarch._fit_cache) == 1
+
     def test_forecast_volatility(self, regular_iv_series: pd.Series) -> None:
         """Test volatility forecasting."""
         from gapless_deribit_clickhouse.features import fit_egarch, forecast_volatility
@@ -49,6 +49,226 @@ class TestFetchTrades:
         with pytest.raises(ValueError, match="limit must be non-negative"):
             fetch_trades(limit=-1)
 
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [
+            ({"underlying": "DOGE"}, "underlying must be one of"),
+            ({"option_type": "call"}, "option_type must be one of"),
+            ({"expiry": "27DEC24"}, "expiry must be YYYY-MM-DD"),
+            ({"strike": -1.0}, "strike must be non-negative"),
+        ],
+    )
+    def test_unmatchable_filters_rejected(self, kwargs, match):
+        """Filter values outside the column domain fail before any query."""
+        from gapless_deribit_clickhouse.api import fetch_trades
+
+        with pytest.raises(ValueError, match=match):
+            fetch_trades(limit=10, **kwargs)
+
+    def test_as_arrow_uses_arrow_query(self, monkeypatch):
+        """as_arrow=True routes through client.query_arrow."""
+        pytest.importorskip("pyarrow")
+        import pandas as pd
+
+        from gapless_deribit_clickhouse import api
+
+        calls: list[str] = []
+
+        class _FakeClient:
+            def query_arrow(self, query, parameters=None, settings=None):
+                calls.append("arrow")
+                return "table"
+
+            def query_df(self, query, parameters=None, settings=None):
+                calls.append("df")
+                return pd.DataFrame({"trade_id": ["1"]})
+
+        monkeypatch.setattr(api, "get_client", lambda: _FakeClient())
+        assert api.fetch_trades(limit=1, as_arrow=True) == "table"
+        assert isinstance(api.fetch_trades(limit=1), pd.DataFrame)
+        assert calls == ["arrow", "df"]
+
+    def test_low_cardinality_columns_are_categorical(self, monkeypatch):
+        """direction/underlying/option_type come back with fixed categories."""
+        import pandas as pd
+
+        from gapless_deribit_clickhouse import api
+
+        class _FakeClient:
+            def query_df(self, query, parameters=None, settings=None):
+                return pd.DataFrame(
+                    {"underlying": ["BTC"], "option_type": ["P"], "price": [0.1]}
+                )
+
+        monkeypatch.setattr(api, "get_client", lambda: _FakeClient())
+        df = api.fetch_trades(limit=1, lookback_days=None)
+
+        assert list(df["underlying"].cat.categories) == ["BTC", "ETH"]
+        assert list(df["option_type"].cat.categories) == ["C", "P"]
+        assert df["price"].dtype == "float64"
+
+    def test_limit_is_bound_as_parameter(self, monkeypatch):
+        """Different limits share one query text; the value travels as a parameter."""
+        import pandas as pd
+
+        from gapless_deribit_clickhouse import api
+
+        seen: list[tuple[str, dict]] = []
+
+        class _FakeClient:
+            def query_df(self, query, parameters=None, settings=None):
+                seen.append((query, parameters))
+                return pd.DataFrame()
+
+        monkeypatch.setattr(api, "get_client", lambda: _FakeClient())
+        api.fetch_trades(underlying="BTC", limit=10, lookback_days=None)
+        api.fetch_trades(underlying="BTC", limit=500, lookback_days=None)
+
+        assert seen[0][0] is seen[1][0]
+        assert [params["limit"] for _, params in seen] == [10, 500]
+
+    def test_limit_only_tries_recent_window_first(self, monkeypatch):
+        """A full recent window is returned; a short one falls back to the full table."""
+        import pandas as pd
+
+        from gapless_deribit_clickhouse import api
+
+        calls: list[dict] = []
+        window_rows = {"n": 5}
+
+        def fake_fetch(table, params, use_final, limit, as_arrow, columns=None):
+            calls.append(params)
+            rows = window_rows["n"] if "start" in params else 5
+            return pd.DataFrame({"trade_id": ["x"] * rows})
+
+        monkeypatch.setattr(api, "_fetch", fake_fetch)
+
+        assert len(api.fetch_trades(underlying="BTC", limit=5)) == 5
+        assert len(calls) == 1 and "start" in calls[0]
+
+        calls.clear()
+        window_rows["n"] = 2
+        assert len(api.fetch_trades(underlying="BTC", limit=5)) == 5
+        assert ["start" in params for params in calls] == [True, False]
+
+        calls.clear()
+        api.fetch_trades(limit=5, lookback_days=None)
+        assert ["start" in params for params in calls] == [False]
+
+    def test_iter_trades_streams_batches(self, monkeypatch):
+        """iter_trades yields Arrow batches and closes the stream when done."""
+        pa = pytest.importorskip("pyarrow")
+        from gapless_deribit_clickhouse import api
+
+        batches = [pa.record_batch({"price": [1.0, 2.0]}), pa.record_batch({"price": [3.0]})]
+        closed: list[bool] = []
+
+        class _Stream:
+            def __enter__(self):
+                return iter(batches)
+
+            def __exit__(self, *exc):
+                closed.append(True)
+
+        class _FakeClient:
+            def query_arrow_stream(self, query, parameters=None, settings=None):
+                assert query.startswith("SELECT price FROM")
+                return _Stream()
+
+        monkeypatch.setattr(api, "get_client", lambda: _FakeClient())
+
+        assert list(api.iter_trades(limit=3, columns=["price"])) == batches
+        assert closed == [True]
+
+        frames = list(api.iter_trades(limit=3, columns=["price"], as_pandas=True))
+        assert [len(df) for df in frames] == [2, 1]
+
+    def test_iter_trades_validates_eagerly(self):
+        """Invalid arguments raise at call time, before iteration."""
+        from gapless_deribit_clickhouse.api import iter_trades
+
+        with pytest.raises(ValueError):
+            iter_trades()
+
+    def test_chunked_fetch_covers_range_newest_first(self, monkeypatch):
+        """chunk_target_rows splits [start, end) into contiguous, adaptive chunks."""
+        import pandas as pd
+
+        from gapless_deribit_clickhouse import api
+
+        ranges: list[tuple[int, int]] = []
+
+        def fake_fetch(table, params, use_final, limit, as_arrow, columns=None):
+            ranges.append((params["start"], params["end"]))
+            return pd.DataFrame({"trade_id": [str(params["start"])] * 10})
+
+        monkeypatch.setattr(api, "_fetch", fake_fetch)
+        chunks = list(
+            api.fetch_trades(
+                start="2024-01-01", end="2024-12-31", chunk_target_rows=20, stream=True
+            )
+        )
+
+        assert len(chunks) == len(ranges) > 1
+        assert ranges[0][1] == api._normalize_timestamp("2024-12-31", is_end=True)
+        assert ranges[-1][0] == api._normalize_timestamp("2024-01-01")
+        assert all(prev[0] == nxt[1] for prev, nxt in zip(ranges, ranges[1:]))
+        # Fewer rows than targeted -> next chunk widens (up to 30 days)
+        assert ranges[1][1] - ranges[1][0] > ranges[0][1] - ranges[0][0]
+
+    def test_chunked_fetch_from_epoch(self, monkeypatch):
+        """A start at the epoch (0 ms) is kept as a bound, not dropped as unset."""
+        import pandas as pd
+
+        from gapless_deribit_clickhouse import api
+
+        starts: list[int] = []
+
+        def fake_fetch(table, params, use_final, limit, as_arrow, columns=None):
+            starts.append(params["start"])
+            return pd.DataFrame({"trade_id": ["a"]})
+
+        monkeypatch.setattr(api, "_fetch", fake_fetch)
+        api.fetch_trades(start="1970-01-01", end="1970-01-03", chunk_target_rows=1)
+
+        assert starts[-1] == 0
+
+    def test_chunked_fetch_concatenates(self, monkeypatch):
+        """Without stream=True, chunks are concatenated into one DataFrame."""
+        import pandas as pd
+
+        from gapless_deribit_clickhouse import api
+
+        monkeypatch.setattr(
+            api, "_fetch", lambda *args: pd.DataFrame({"trade_id": ["a", "b"]})
+        )
+        df = api.fetch_trades(start="2024-01-01", end="2024-01-31", chunk_target_rows=1)
+
+        assert len(df) % 2 == 0 and len(df) > 2
+        assert list(df.index) == list(range(len(df)))
+
+    def test_columns_are_validated(self):
+        """Unknown, empty, or string column projections are rejected."""
+        from gapless_deribit_clickhouse.api import fetch_trades
+
+        with pytest.raises(ValueError, match="Unknown column"):
+            fetch_trades(limit=1, columns=["price", "1; DROP TABLE x"])
+        with pytest.raises(ValueError, match="cannot be empty"):
+            fetch_trades(limit=1, columns=[])
+        with pytest.raises(ValueError, match="sequence of names"):
+            fetch_trades(limit=1, columns="price")
+
+    def test_chunked_fetch_requires_bounded_range(self):
+        """stream/chunk_target_rows need start and end and no limit."""
+        from gapless_deribit_clickhouse.api import fetch_trades
+
+        with pytest.raises(ValueError, match="require start and end"):
+            fetch_trades(start="2024-01-01", stream=True)
+        with pytest.raises(ValueError, match="require start and end"):
+            fetch_trades(start="2024-01-01", end="2024-01-31", limit=10, chunk_target_rows=5)
+        with pytest.raises(ValueError, match="must be positive"):
+            fetch_trades(start="2024-01-01", end="2024-01-31", chunk_target_rows=0)
+
     def test_with_limit(self, skip_without_credentials):
         """fetch_trades with limit returns DataFrame."""
         from gapless_deribit_clickhouse.api import fetch_trades
@@ -60,3 +280,96 @@ class TestFetchTrades:
             assert "trade_id" in df.columns
             assert "instrument_name" in df.columns
             assert "underlying" in df.columns
+
+
+class TestNormalizeTimestamp:
+    """Tests for _normalize_timestamp helper."""
+
+    def test_date_only_start_is_midnight(self):
+        from gapless_deribit_clickhouse.api import _normalize_timestamp
+
+        assert _normalize_timestamp("2024-01-31") == 1706659200000
+
+    def test_date_only_end_expands_to_next_day(self):
+        from gapless_deribit_clickhouse.api import _normalize_timestamp
+
+        assert _normalize_timestamp("2024-01-31", is_end=True) == 1706745600000
+
+    def test_timestamp_end_not_expanded(self):
+        from gapless_deribit_clickhouse.api import _normalize_timestamp
+
+        result = _normalize_timestamp("2024-01-31T12:30:45.123456", is_end=True)
+        assert result == 1706704245123
+
+    def test_space_separated_timestamp(self):
+        from gapless_deribit_clickhouse.api import _normalize_timestamp
+
+        assert _normalize_timestamp("2024-01-31 00:00:00") == 1706659200000
+
+    def test_timezone_aware_converted_to_utc(self):
+        from gapless_deribit_clickhouse.api import _normalize_timestamp
+
+        assert _normalize_timestamp("2024-01-31T02:00:00+02:00") == 1706659200000
+
+    def test_non_iso_date_falls_back_to_pandas(self):
+        from gapless_deribit_clickhouse.api import _normalize_timestamp
+
+        assert _normalize_timestamp("Jan 31 2024", is_end=True) == 1706745600000
+
+    def test_invalid_timestamp_rejected(self):
+        from gapless_deribit_clickhouse.api import _normalize_timestamp
+
+        with pytest.raises(ValueError, match="Invalid timestamp"):
+            _normalize_timestamp("not-a-date")
+
+
+class TestBuildFetchQuery:
+    """Tests for memoized fetch_trades SQL builder."""
+
+    def test_conditions_follow_filter_order(self):
+        from gapless_deribit_clickhouse.api import TRADES_TABLE, _build_fetch_query
+
+        query = _build_fetch_query(
+            TRADES_TABLE, frozenset({"start", "underlying"}), True, False
+        )
+        assert (
+            "underlying = {underlying:String} AND "
+            "timestamp >= fromUnixTimestamp64Milli({start:Int64})"
+        ) in query
+        assert "FINAL" in query
+        assert "LIMIT" not in query
+        assert "ORDER BY" not in query
+
+    def test_time_bounds_restate_partition_key(self):
+        from gapless_deribit_clickhouse.api import TRADES_TABLE, _build_fetch_query
+
+        query = _build_fetch_query(TRADES_TABLE, frozenset({"start", "end"}), True, False)
+        assert "toYYYYMM(timestamp) >= toYYYYMM(fromUnixTimestamp64Milli({start:Int64}))" in query
+        # End bound is exclusive, so the last partition is the one holding end - 1ms
+        assert "toYYYYMM(timestamp) <= toYYYYMM(fromUnixTimestamp64Milli({end:Int64} - 1))" in query
+
+    def test_no_filters_selects_all(self):
+        from gapless_deribit_clickhouse.api import TRADES_TABLE, _build_fetch_query
+
+        query = _build_fetch_query(TRADES_TABLE, frozenset(), False, True)
+        assert "WHERE 1=1" in query
+        assert "FINAL" not in query
+        assert query.endswith("ORDER BY timestamp DESC LIMIT {limit:UInt64}")
+
+    def test_columns_projected_in_order(self):
+        from gapless_deribit_clickhouse.api import TRADES_TABLE, _build_fetch_query
+
+        query = _build_fetch_query(
+            TRADES_TABLE, frozenset(), False, True, ("timestamp", "price")
+        )
+        assert query.startswith("SELECT timestamp, price FROM")
+        assert _build_fetch_query(TRADES_TABLE, frozenset(), False, True).startswith(
+            "SELECT * FROM"
+        )
+
+    def test_same_shape_is_cached(self):
+        from gapless_deribit_clickhouse.api import TRADES_TABLE, _build_fetch_query
+
+        first = _build_fetch_query(TRADES_TABLE, frozenset({"underlying"}), True, True)
+        second = _build_fetch_query(TRADES_TABLE, frozenset({"underlying"}), True, True)
+        assert first is second
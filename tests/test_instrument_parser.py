@@ -65,6 +65,17 @@ class TestParseInstrument:
         with pytest.raises(InstrumentParseError):
             parse_instrument("BTC-27DEC24-100000")
 
+    def test_repeated_names_are_memoized(self):
+        """Same name returns the same cached (immutable) result."""
+        first = parse_instrument("BTC-26JUN26-150000-P")
+        assert parse_instrument("BTC-26JUN26-150000-P") is first
+
+    def test_invalid_names_raise_every_time(self):
+        """Failures are not cached."""
+        for _ in range(2):
+            with pytest.raises(InstrumentParseError):
+                parse_instrument("BTC-27DEC24-100000-X")
+
 
 class TestParseExpiry:
     """Tests for parse_expiry function."""
@@ -0,0 +1,166 @@
+"""Unit tests for AWS Cost Explorer response handling (no AWS calls).
+
+ADR: 2025-12-08-clickhouse-data-pipeline-architecture
+"""
+
+from datetime import date, timedelta
+
+from gapless_deribit_clickhouse.billing import aws_cost_explorer
+from gapless_deribit_clickhouse.billing.aws_cost_explorer import AWSCostExplorer
+
+
+class _FakeCE:
+    """Stand-in for the boto3 Cost Explorer client; records each request."""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+
+    def get_cost_and_usage(self, **request):
+        self.requests.append(request)
+        start = date.fromisoformat(request["TimePeriod"]["Start"])
+        end = date.fromisoformat(request["TimePeriod"]["End"])
+        results = []
+        day = start
+        while day < end:
+            results.append(
+                {
+                    "TimePeriod": {
+                        "Start": day.isoformat(),
+                        "End": (day + timedelta(days=1)).isoformat(),
+                    },
+                    "Groups": [
+                        {"Keys": ["AWS Lambda"], "Metrics": {"BlendedCost": {"Amount": "1.5"}}},
+                        {
+                            "Keys": ["AWS Data Transfer"],
+                            "Metrics": {"BlendedCost": {"Amount": "0.5"}},
+                        },
+                    ],
+                }
+            )
+            day += timedelta(days=1)
+        return {"ResultsByTime": results}
+
+
+class _PagedCE:
+    """Serves one day's service groups split across NextPageToken pages."""
+
+    def __init__(self, pages: int):
+        self.pages = pages
+        self.requests: list[dict] = []
+
+    def get_cost_and_usage(self, **request):
+        self.requests.append(request)
+        page = len(self.requests)
+        day = date.fromisoformat(request["TimePeriod"]["Start"])
+        response = {
+            "ResultsByTime": [
+                {
+                    "TimePeriod": {
+                        "Start": day.isoformat(),
+                        "End": (day + timedelta(days=1)).isoformat(),
+                    },
+                    "Groups": [
+                        {"Keys": ["AWS Lambda"], "Metrics": {"BlendedCost": {"Amount": "1.0"}}}
+                    ],
+                }
+            ]
+        }
+        if page < self.pages:
+            response["NextPageToken"] = f"page-{page + 1}"
+        return response
+
+
+def _explorer() -> tuple[AWSCostExplorer, _FakeCE]:
+    explorer = AWSCostExplorer(region="us-west-2")
+    fake = _FakeCE()
+    explorer._client = fake
+    return explorer, fake
+
+
+class TestGetDailyBreakdown:
+    """Tests for get_daily_breakdown batching."""
+
+    def test_single_request_for_all_days(self):
+        explorer, fake = _explorer()
+        costs = explorer.get_daily_breakdown(days=5)
+
+        assert len(fake.requests) == 1
+        assert fake.requests[0]["Granularity"] == "DAILY"
+        assert len(costs) == 5
+
+    def test_one_cost_per_day_in_chronological_order(self):
+        explorer, _ = _explorer()
+        costs = explorer.get_daily_breakdown(days=3)
+
+        today = date.today()
+        assert [c.period_start for c in costs] == [
+            today - timedelta(days=2),
+            today - timedelta(days=1),
+            today,
+        ]
+        assert all(c.period_start == c.period_end for c in costs)
+        assert all(c.lambda_cost == 1.5 and c.total_cost == 2.0 for c in costs)
+
+    def test_zero_days_skips_request(self):
+        explorer, fake = _explorer()
+        assert explorer.get_daily_breakdown(days=0) == []
+        assert fake.requests == []
+
+    def test_day_split_across_pages_is_merged(self):
+        explorer = AWSCostExplorer(region="us-west-2")
+        explorer._client = fake = _PagedCE(pages=3)
+
+        [cost] = explorer.get_daily_breakdown(days=1)
+
+        assert len(fake.requests) == 3
+        assert fake.requests[-1]["NextPageToken"] == "page-3"
+        assert cost.lambda_cost == 3.0
+
+    def test_truncated_pagination_is_logged(self, caplog):
+        explorer = AWSCostExplorer(region="us-west-2")
+        explorer._client = fake = _PagedCE(pages=aws_cost_explorer.MAX_COST_EXPLORER_PAGES + 1)
+
+        with caplog.at_level("WARNING", logger=aws_cost_explorer.__name__):
+            explorer.get_daily_breakdown(days=1)
+
+        assert len(fake.requests) == aws_cost_explorer.MAX_COST_EXPLORER_PAGES
+        assert "undercounted" in caplog.text
+
+    def test_complete_pagination_does_not_warn(self, caplog):
+        explorer = AWSCostExplorer(region="us-west-2")
+        explorer._client = _PagedCE(pages=aws_cost_explorer.MAX_COST_EXPLORER_PAGES)
+
+        with caplog.at_level("WARNING", logger=aws_cost_explorer.__name__):
+            explorer.get_daily_breakdown(days=1)
+
+        assert caplog.text == ""
+
+
+class TestParseCostResults:
+    """Tests for service-to-field cost aggregation."""
+
+    def test_services_map_to_cost_fields(self):
+        explorer, _ = _explorer()
+        day = date(2024, 1, 31)
+        groups = [
+            ("AWS Lambda", "1.0"),
+            ("Amazon EC2 Spot", "2.0"),
+            ("Amazon Elastic Compute Cloud - Compute", "3.0"),
+            ("AWS Data Transfer", "4.0"),
+            ("Amazon S3", "100.0"),  # Not a pipeline service
+        ]
+        results = [
+            {
+                "Groups": [
+                    {"Keys": [name], "Metrics": {"BlendedCost": {"Amount": amount}}}
+                    for name, amount in groups
+                ]
+            }
+        ] * 2
+
+        cost = explorer._parse_cost_results(results, day, day)
+
+        assert cost.lambda_cost == 2.0
+        assert cost.ec2_spot_cost == 10.0
+        assert cost.data_transfer_cost == 8.0
+        assert cost.total_cost == 20.0
@@ -0,0 +1,43 @@
+"""Unit tests for ClickHouse Cloud billing client (mocked HTTP transport).
+
+ADR: 2025-12-08-clickhouse-data-pipeline-architecture
+"""
+
+from datetime import date, timedelta
+
+import httpx
+
+from gapless_deribit_clickhouse.billing.clickhouse_cloud import ClickHouseCloudBilling
+
+
+def _billing(requested: list[str]) -> ClickHouseCloudBilling:
+    def handler(request: httpx.Request) -> httpx.Response:
+        day = request.url.params["from_date"]
+        requested.append(day)
+        return httpx.Response(200, json={"costs": {"totalCHC": date.fromisoformat(day).day}})
+
+    return ClickHouseCloudBilling(
+        api_key_id="key",
+        api_key_secret="secret",
+        organization_id="org",
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+
+class TestGetDailyBreakdown:
+    """Tests for concurrent daily breakdown."""
+
+    def test_one_cost_per_day_in_chronological_order(self):
+        requested: list[str] = []
+        costs = _billing(requested).get_daily_breakdown(days=10)
+
+        today = date.today()
+        expected = [today - timedelta(days=i) for i in range(9, -1, -1)]
+        assert [c.period_start for c in costs] == expected
+        assert [c.total_chc for c in costs] == [float(d.day) for d in expected]
+        assert sorted(requested) == sorted(d.isoformat() for d in expected)
+
+    def test_zero_days_skips_requests(self):
+        requested: list[str] = []
+        assert _billing(requested).get_daily_breakdown(days=0) == []
+        assert requested == []
@@ -0,0 +1,70 @@
+"""Unit tests for ClickHouse credential resolution.
+
+ADR: 2025-12-07-schema-first-e2e-validation
+"""
+
+import pytest
+
+from gapless_deribit_clickhouse.clickhouse import config
+from gapless_deribit_clickhouse.exceptions import CredentialError
+
+
+class TestParseEnvFile:
+    """Tests for the minimal .env parser."""
+
+    def test_parses_supported_syntax(self, tmp_path):
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            "# comment\n"
+            "\n"
+            "CLICKHOUSE_HOST_READONLY=host.example.com\n"
+            "export CLICKHOUSE_USER_READONLY = reader\n"
+            "CLICKHOUSE_PASSWORD_READONLY='p#ss word'\n"
+            'QUOTED="value"\n'
+            "TRAILING=value # note\n"
+            "EMPTY=\n"
+            "not a pair\n"
+        )
+
+        assert config._parse_env_file(env_file) == {
+            "CLICKHOUSE_HOST_READONLY": "host.example.com",
+            "CLICKHOUSE_USER_READONLY": "reader",
+            "CLICKHOUSE_PASSWORD_READONLY": "p#ss word",
+            "QUOTED": "value",
+            "TRAILING": "value",
+            "EMPTY": "",
+        }
+
+
+class TestGetCredentials:
+    """Tests for get_credentials resolution and memoization."""
+
+    @pytest.fixture(autouse=True)
+    def _isolated(self, monkeypatch):
+        for name in (config.ENV_HOST, config.ENV_USER, config.ENV_PASSWORD):
+            # setenv first so monkeypatch restores vars the .env parser writes
+            monkeypatch.setenv(name, "")
+            monkeypatch.delenv(name)
+        config.get_credentials.cache_clear()
+        yield
+        config.get_credentials.cache_clear()
+
+    def test_env_file_overrides_environment(self, tmp_path, monkeypatch):
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            f"{config.ENV_HOST}=file-host\n{config.ENV_USER}=u\n{config.ENV_PASSWORD}=p\n"
+        )
+        monkeypatch.setenv(config.ENV_HOST, "env-host")
+        monkeypatch.setattr(config, "_find_env_file", lambda: env_file)
+
+        assert config.get_credentials() == ("file-host", "u", "p")
+
+    def test_missing_credentials_raise_and_are_not_cached(self, monkeypatch):
+        monkeypatch.setattr(config, "_find_env_file", lambda: None)
+        with pytest.raises(CredentialError):
+            config.get_credentials()
+
+        monkeypatch.setenv(config.ENV_HOST, "h")
+        monkeypatch.setenv(config.ENV_USER, "u")
+        monkeypatch.setenv(config.ENV_PASSWORD, "p")
+        assert config.get_credentials() == ("h", "u", "p")
@@ -0,0 +1,66 @@
+"""Unit tests for ClickHouse client caching.
+
+ADR: 2025-12-08-clickhouse-data-pipeline-architecture (dual-mode)
+"""
+
+import pytest
+
+from gapless_deribit_clickhouse.clickhouse import connection
+
+
+class _FakeClient:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_factories(monkeypatch):
+    """Replace real client factories with counters (no network)."""
+    created: list[str] = []
+
+    def _local():
+        created.append("local")
+        return _FakeClient()
+
+    def _cloud():
+        created.append("cloud")
+        return _FakeClient()
+
+    monkeypatch.setattr(connection, "_clients", {})
+    monkeypatch.setattr(connection, "_get_local_client", _local)
+    monkeypatch.setattr(connection, "_get_cloud_client", _cloud)
+    return created
+
+
+class TestGetClient:
+    """Tests for get_client caching."""
+
+    def test_client_reused_per_mode(self, fake_factories):
+        """Repeated calls with the same mode return the cached client."""
+        first = connection.get_client(mode="local")
+        second = connection.get_client(mode="local")
+        assert first is second
+        assert fake_factories == ["local"]
+
+    def test_modes_cached_separately(self, fake_factories):
+        """Local and cloud clients are distinct cache entries."""
+        local = connection.get_client(mode="local")
+        cloud = connection.get_client(mode="cloud")
+        assert local is not cloud
+        assert fake_factories == ["local", "cloud"]
+
+    def test_mode_resolved_from_env(self, fake_factories, monkeypatch):
+        """CLICKHOUSE_MODE selects the cached entry when mode is omitted."""
+        monkeypatch.setenv("CLICKHOUSE_MODE", "local")
+        assert connection.get_client() is connection.get_client(mode="local")
+        assert fake_factories == ["local"]
+
+    def test_close_client_resets_cache(self, fake_factories):
+        """close_client closes cached clients and forces a reconnect."""
+        first = connection.get_client(mode="local")
+        connection.close_client()
+        assert first.closed
+        assert connection.get_client(mode="local") is not first
+        assert fake_factories == ["local", "local"]
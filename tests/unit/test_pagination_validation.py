@@ -3,7 +3,12 @@
 ADR: 2025-12-08-mise-pagination-validation
 """
 
-from gapless_deribit_clickhouse.collectors.trades_collector import _validate_page_continuity
+from gapless_deribit_clickhouse.collectors import trades_collector
+from gapless_deribit_clickhouse.collectors.trades_collector import (
+    _check_page_continuity,
+    _summarize_page,
+    _validate_page_continuity,
+)
 
 
 class TestValidatePageContinuity:
@@ -56,8 +61,8 @@ class TestValidatePageContinuity:
         assert "4000ms" in warnings[0]
 
     def test_custom_threshold(self, monkeypatch):
-        """Custom threshold from environment should be respected."""
-        monkeypatch.setenv("PAGINATION_GAP_THRESHOLD_MS", "5000")
+        """Custom threshold (PAGINATION_GAP_THRESHOLD_MS, read at import) is respected."""
+        monkeypatch.setattr(trades_collector, "PAGINATION_GAP_THRESHOLD_MS", 5000)
         prev = [{"trade_id": "1", "timestamp": 5000}]
         curr = [{"trade_id": "2", "timestamp": 1000}]  # 4000ms gap < 5000ms threshold
         is_valid, warnings = _validate_page_continuity(prev, curr)
@@ -116,3 +121,22 @@ class TestValidatePageContinuity:
         is_valid, warnings = _validate_page_continuity(prev, curr)
         assert is_valid
         assert not warnings
+
+
+class TestCheckPageContinuity:
+    """Tests for the summary-based check used by the collection loop."""
+
+    def test_summary_is_reused_as_previous_page(self):
+        """One summary per page serves both sides of consecutive checks."""
+        pages = [
+            [{"trade_id": "1", "timestamp": 3000}, {"trade_id": "2", "timestamp": 2500}],
+            [{"trade_id": "3", "timestamp": 2400}, {"trade_id": "2", "timestamp": 2300}],
+        ]
+        first, second = (_summarize_page(page) for page in pages)
+
+        assert (first.oldest_ts, first.newest_ts) == (2500, 3000)
+        assert _summarize_page(pages[0], sorted_desc=True) == first
+        assert _summarize_page([]) is None
+        is_valid, warnings = _check_page_continuity(first, second)
+        assert not is_valid
+        assert warnings == ["Duplicates: 1 trades appear in both pages"]
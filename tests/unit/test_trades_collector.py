@@ -0,0 +1,581 @@
+"""Unit tests for trades collector batching (no network, no ClickHouse).
+
+ADR: 2025-12-10-schema-optimization (memory-bounded collection)
+"""
+
+import pytest
+
+from gapless_deribit_clickhouse.collectors import trades_collector
+
+START_TS = 1704067200000  # 2024-01-01
+TRADES_PER_PAGE = 4
+TOTAL_PAGES = 5
+
+
+@pytest.fixture
+def fake_api(monkeypatch, tmp_path, trade_factory):
+    """Serve TOTAL_PAGES pages of descending trades and record inserts."""
+    inserted: list[int] = []
+
+    def _fetch(currency, kind, start_timestamp, end_timestamp, count=1000):
+        trades = [
+            trade_factory(trade_id=str(ts), timestamp=ts)
+            for ts in range(end_timestamp, end_timestamp - TRADES_PER_PAGE, -1)
+            if ts > START_TS and ts >= start_timestamp
+        ]
+        return {"trades": trades}
+
+    def _insert(df, currency, batch, client=None):
+        inserted.append(len(df))
+
+    monkeypatch.setattr(trades_collector, "_fetch_trades_page", _fetch)
+    monkeypatch.setattr(trades_collector, "_insert_trades_with_dedup", _insert)
+    monkeypatch.setattr(trades_collector, "get_client", lambda: object())
+    monkeypatch.setattr(trades_collector, "BATCH_SIZE_FOR_INSERT", 2 * TRADES_PER_PAGE)
+    monkeypatch.setattr(trades_collector, "DEFAULT_CHECKPOINT_DIR", tmp_path)
+    monkeypatch.setattr(
+        trades_collector,
+        "_resolve_time_range",
+        lambda start, end: (START_TS, START_TS + TRADES_PER_PAGE * TOTAL_PAGES),
+    )
+    return inserted
+
+
+@pytest.fixture
+def dedup_store(fake_api, monkeypatch):
+    """Emulate server-side token deduplication: return trade_ids per stored token."""
+    stored: dict[str, list[str]] = {}
+
+    def _insert(df, currency, batch, client=None):
+        token = trades_collector._generate_deduplication_token(currency, df)
+        stored.setdefault(token, list(df["trade_id"]))
+
+    monkeypatch.setattr(trades_collector, "_insert_trades_with_dedup", _insert)
+    return stored
+
+
+class TestCollectTradesIter:
+    """Tests for collect_trades_iter streaming."""
+
+    def test_yields_insert_sized_batches(self, fake_api):
+        batches = list(trades_collector.collect_trades_iter())
+        assert [len(b) for b in batches] == [8, 8, 4]
+        assert sorted(fake_api) == [4, 8, 8]  # Concurrent workers may finish in any order
+
+    def test_byte_budget_flushes_early(self, fake_api, monkeypatch, trade_factory):
+        page_bytes = trades_collector._estimate_batch_bytes(
+            [trade_factory(trade_id=str(START_TS), timestamp=START_TS)] * TRADES_PER_PAGE
+        )
+        monkeypatch.setattr(trades_collector, "BATCH_SIZE_FOR_INSERT_BYTES", page_bytes)
+
+        batches = list(trades_collector.collect_trades_iter())
+
+        assert [len(b) for b in batches] == [4, 4, 4, 4, 4]
+
+    def test_concurrent_windows_keep_newest_first_order(self, fake_api, monkeypatch):
+        monkeypatch.setattr(trades_collector, "PAGINATION_WORKERS", 4)
+        monkeypatch.setattr(trades_collector, "_INITIAL_WINDOW_MS", 3)
+        monkeypatch.setattr(trades_collector, "_MIN_WINDOW_MS", 3)
+        monkeypatch.setattr(trades_collector, "_MAX_WINDOW_MS", 3)
+
+        batches = list(trades_collector.collect_trades_iter(insert_to_db=False))
+
+        trade_ids = [tid for batch in batches for tid in batch["trade_id"]]
+        expected = range(START_TS + TRADES_PER_PAGE * TOTAL_PAGES, START_TS, -1)
+        assert trade_ids == [str(ts) for ts in expected]
+
+    def test_dry_run_skips_inserts(self, fake_api):
+        batches = list(trades_collector.collect_trades_iter(insert_to_db=False))
+        assert sum(len(b) for b in batches) == TRADES_PER_PAGE * TOTAL_PAGES
+        assert fake_api == []
+
+    def test_batches_yield_only_after_insert(self, fake_api):
+        seen = []
+        for batch in trades_collector.collect_trades_iter():
+            seen.append(len(batch))
+            assert len(fake_api) >= len(seen)  # Pipelined insert already confirmed
+        assert seen == [8, 8, 4]
+
+    def test_failed_insert_does_not_checkpoint(self, fake_api, monkeypatch, tmp_path):
+        def _fail(df, currency, batch, client=None):
+            raise RuntimeError("insert failed")
+
+        monkeypatch.setattr(trades_collector, "_insert_trades_with_dedup", _fail)
+        with pytest.raises(RuntimeError, match="insert failed"):
+            list(trades_collector.collect_trades_iter())
+        assert list(tmp_path.iterdir()) == []
+
+    def test_checkpoint_lands_when_consumer_stops_early(self, fake_api, tmp_path):
+        stream = trades_collector.collect_trades_iter()
+        next(stream)
+        stream.close()
+
+        [checkpoint_path] = tmp_path.iterdir()
+        assert trades_collector._load_checkpoint(checkpoint_path)["batch_number"] == 1
+
+    def test_failed_insert_retries_with_same_batch(self, fake_api, monkeypatch):
+        attempts: list[int] = []
+
+        def _flaky(df, currency, batch, client=None):
+            attempts.append(batch)
+            if attempts.count(batch) == 1 and batch == 2:
+                raise RuntimeError("transient")
+
+        monkeypatch.setattr(trades_collector, "_insert_trades_with_dedup", _flaky)
+        batches = list(trades_collector.collect_trades_iter())
+
+        assert [len(b) for b in batches] == [8, 8, 4]
+        assert sorted(attempts) == [1, 2, 2, 3]
+
+    def test_conversion_runs_on_insert_workers(self, fake_api, monkeypatch):
+        import threading
+
+        threads: list[str] = []
+        to_frame = trades_collector._trades_to_frame
+
+        def _recording_to_frame(trades):
+            threads.append(threading.current_thread().name)
+            return to_frame(trades)
+
+        monkeypatch.setattr(trades_collector, "_trades_to_frame", _recording_to_frame)
+        list(trades_collector.collect_trades_iter())
+
+        assert len(threads) == 3
+        assert all(name.startswith("trades-insert") for name in threads)
+
+    def test_client_resolved_once_per_backfill(self, fake_api, monkeypatch):
+        sentinel = object()
+        resolved: list[object] = []
+        clients: list[object] = []
+
+        def _get_client():
+            resolved.append(sentinel)
+            return sentinel
+
+        def _insert(df, currency, batch, client=None):
+            clients.append(client)
+
+        monkeypatch.setattr(trades_collector, "get_client", _get_client)
+        monkeypatch.setattr(trades_collector, "_insert_trades_with_dedup", _insert)
+        list(trades_collector.collect_trades_iter())
+
+        assert len(resolved) == 1
+        assert clients == [sentinel] * 3
+
+    def test_resume_after_interrupt_with_inserts_in_flight(self, dedup_store, monkeypatch):
+        import threading
+
+        started = threading.Semaphore(0)
+        release = threading.Event()
+        insert = trades_collector._insert_trades_with_dedup
+
+        def _slow_insert(df, currency, batch, client=None):
+            if batch > 1:
+                started.release()
+                release.wait(timeout=5)
+            insert(df, currency, batch, client=client)
+
+        monkeypatch.setattr(trades_collector, "BATCH_SIZE_FOR_INSERT", TRADES_PER_PAGE)
+        monkeypatch.setattr(trades_collector, "_insert_trades_with_dedup", _slow_insert)
+        stream = trades_collector.collect_trades_iter()
+        next(stream)
+        # The executor may reuse batch 1's idle thread rather than start a new
+        # one, so wait until every later batch is running before interrupting
+        for _ in range(trades_collector.INSERT_WORKERS - 1):
+            assert started.acquire(timeout=5)
+        assert len(dedup_store) == 1  # Later batches are still inserting
+        release.set()
+        stream.close()
+        assert len(dedup_store) == trades_collector.INSERT_WORKERS  # Landed, not checkpointed
+
+        list(trades_collector.collect_trades_iter())
+
+        # Landed-but-unconfirmed batches were rebuilt identically and deduped
+        landed = [tid for trade_ids in dedup_store.values() for tid in trade_ids]
+        expected = range(START_TS + TRADES_PER_PAGE * TOTAL_PAGES, START_TS, -1)
+        assert sorted(landed) == sorted(str(ts) for ts in expected)
+
+    def test_resume_with_shifted_batches_loses_nothing(self, dedup_store, monkeypatch):
+        # Stop after the first batch with later inserts already landed, then
+        # resume with different batch boundaries (as drifting window/density
+        # state produces): no rebuilt batch may collide with a stored token
+        monkeypatch.setattr(trades_collector, "BATCH_SIZE_FOR_INSERT", TRADES_PER_PAGE)
+        stream = trades_collector.collect_trades_iter()
+        next(stream)
+        stream.close()
+
+        monkeypatch.setattr(trades_collector, "BATCH_SIZE_FOR_INSERT", 2 * TRADES_PER_PAGE)
+        list(trades_collector.collect_trades_iter())
+
+        landed = {tid for trade_ids in dedup_store.values() for tid in trade_ids}
+        expected = range(START_TS + TRADES_PER_PAGE * TOTAL_PAGES, START_TS, -1)
+        assert landed == {str(ts) for ts in expected}
+
+
+class TestPaginate:
+    """Tests for density-narrowed pagination."""
+
+    def test_narrowed_requests_cover_range_once(self, monkeypatch, trade_factory):
+        # One trade every 2ms, plus an empty stretch the slices must widen across
+        stamps = [ts for ts in range(1000, 0, -2) if not 400 < ts < 700]
+        starts: list[int] = []
+
+        def _fetch(currency, kind, start_timestamp, end_timestamp, count=1000):
+            starts.append(start_timestamp)
+            trades = [
+                trade_factory(trade_id=str(ts), timestamp=ts)
+                for ts in stamps
+                if start_timestamp <= ts <= end_timestamp
+            ]
+            return {"trades": trades[:count]}
+
+        monkeypatch.setattr(trades_collector, "_fetch_trades_page", _fetch)
+        monkeypatch.setattr(trades_collector, "DEFAULT_COUNT", 10)
+
+        pages = list(trades_collector._paginate("BTC", 1, 1000))
+
+        assert [t["timestamp"] for page in pages for t in page] == stamps
+        assert starts[0] == 1
+        assert starts[1] > 1  # Narrowed after the first full page
+
+    def test_unsorted_page_raises(self, monkeypatch, trade_factory):
+        from gapless_deribit_clickhouse.exceptions import APIError
+
+        def _fetch(currency, kind, start_timestamp, end_timestamp, count=1000):
+            return {"trades": [trade_factory(trade_id=str(ts), timestamp=ts) for ts in (1, 2)]}
+
+        monkeypatch.setattr(trades_collector, "_fetch_trades_page", _fetch)
+
+        with pytest.raises(APIError, match="not sorted desc"):
+            list(trades_collector._paginate("BTC", 1, 1000))
+
+    def test_page_cache_serves_historical_pages(self, monkeypatch, tmp_path, trade_factory):
+        import time
+
+        calls: list[int] = []
+
+        def _fetch(currency, kind, start_timestamp, end_timestamp, count=1000):
+            calls.append(end_timestamp)
+            return {"trades": [trade_factory(trade_id="1", timestamp=end_timestamp)]}
+
+        monkeypatch.setattr(trades_collector, "_fetch_trades_page", _fetch)
+        monkeypatch.setattr(trades_collector, "PAGE_CACHE_DIR", str(tmp_path))
+        recent = int(time.time() * 1000)
+
+        for _ in range(2):
+            cached = trades_collector._fetch_trades_page_cached("BTC", "option", 0, START_TS)
+            trades_collector._fetch_trades_page_cached("BTC", "option", 0, recent)
+
+        assert calls == [START_TS, recent, recent]
+        assert cached["trades"][0]["timestamp"] == START_TS
+
+
+class TestCollectTrades:
+    """Tests for collect_trades return modes."""
+
+    def test_returns_bounded_dataframe(self, fake_api):
+        df = trades_collector.collect_trades(return_data=True, max_memory_rows=6)
+        assert len(df) == 6
+        # Oldest trades are the last collected (pagination is newest-first)
+        assert df["trade_id"].iloc[-1] == str(START_TS + 1)
+
+    def test_returns_stats_without_data(self, fake_api):
+        stats = trades_collector.collect_trades(return_data=False)
+        assert stats["total_collected"] == TRADES_PER_PAGE * TOTAL_PAGES
+        assert stats["batches"] == 3
+
+    def test_default_keeps_data_only_for_dry_runs(self, fake_api):
+        assert isinstance(trades_collector.collect_trades(), dict)
+        df = trades_collector.collect_trades(insert_to_db=False)
+        assert len(df) == TRADES_PER_PAGE * TOTAL_PAGES
+
+
+class TestFetchTradesPage:
+    """Tests for the history API page fetch."""
+
+    def test_pages_share_one_http_client(self, monkeypatch):
+        import httpx
+
+        seen: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.params["end_timestamp"])
+            return httpx.Response(200, json={"result": {"trades": []}})
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(trades_collector, "_http_client", client)
+
+        for end_ts in (2, 1):
+            trades_collector._fetch_trades_page("BTC", "option", 0, end_ts)
+
+        assert seen == ["2", "1"]
+        assert trades_collector._get_http_client() is client
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_parses_page_with_or_without_orjson(self, monkeypatch, use_orjson):
+        import httpx
+
+        if not use_orjson:
+            monkeypatch.setattr(trades_collector, "orjson", None)
+        client = httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200, json={"result": {"trades": [{"trade_id": "1"}], "has_more": False}}
+                )
+            )
+        )
+        monkeypatch.setattr(trades_collector, "_http_client", client)
+
+        result = trades_collector._fetch_trades_page("BTC", "option", 0, 1)
+
+        assert result == {"trades": [{"trade_id": "1"}], "has_more": False}
+
+    def test_compressed_page_is_decoded_and_logged_once(self, monkeypatch, caplog):
+        import gzip
+        import json
+        import logging
+
+        import httpx
+
+        body = gzip.compress(json.dumps({"result": {"trades": []}}).encode())
+        client = httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200, content=body, headers={"Content-Encoding": "gzip"}
+                )
+            )
+        )
+        monkeypatch.setattr(trades_collector, "_http_client", client)
+        monkeypatch.setattr(trades_collector, "_content_encoding_logged", False)
+
+        with caplog.at_level(logging.INFO, logger=trades_collector.__name__):
+            for _ in range(2):
+                assert trades_collector._fetch_trades_page("BTC", "option", 0, 1) == {"trades": []}
+
+        encoding_logs = [r for r in caplog.records if "response encoding" in r.message]
+        assert len(encoding_logs) == 1
+        assert "gzip" in encoding_logs[0].message
+
+    def test_rate_limit_response_slows_pace(self, monkeypatch):
+        import httpx
+
+        from gapless_deribit_clickhouse.exceptions import RateLimitError
+
+        limiter = trades_collector._RateLimiter(max_rate=10.0, min_rate=1.0)
+        client = httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(429, headers={"Retry-After": "0"}, text="slow down")
+            )
+        )
+        monkeypatch.setattr(trades_collector, "_RATE_LIMITER", limiter)
+        monkeypatch.setattr(trades_collector, "_http_client", client)
+
+        # __wrapped__ skips the tenacity retry/backoff
+        with pytest.raises(RateLimitError):
+            trades_collector._fetch_trades_page.__wrapped__("BTC", "option", 0, 1)
+        assert limiter.current_rate == 5.0
+
+    @pytest.fixture
+    def counting_client(self, monkeypatch):
+        """Route pages through a MockTransport with retries but no backoff."""
+        import httpx
+        from tenacity import wait_none
+
+        def install(handler):
+            calls: list[int] = []
+
+            def _handler(request):
+                calls.append(1)
+                return handler(request)
+
+            client = httpx.Client(transport=httpx.MockTransport(_handler))
+            monkeypatch.setattr(trades_collector, "_http_client", client)
+            monkeypatch.setattr(trades_collector._fetch_trades_page.retry, "wait", wait_none())
+            return calls
+
+        return install
+
+    def test_api_error_is_not_retried(self, counting_client):
+        import httpx
+
+        from gapless_deribit_clickhouse.exceptions import APIError
+
+        calls = counting_client(lambda request: httpx.Response(400, text="bad request"))
+        with pytest.raises(APIError):
+            trades_collector._fetch_trades_page("BTC", "option", 0, 1)
+        assert len(calls) == 1
+
+    def test_transport_error_is_retried(self, counting_client):
+        import httpx
+
+        def flaky(request):
+            if len(calls) < trades_collector.MAX_RETRIES:
+                raise httpx.ConnectError("reset", request=request)
+            return httpx.Response(200, json={"result": {"trades": []}})
+
+        calls = counting_client(flaky)
+        assert trades_collector._fetch_trades_page("BTC", "option", 0, 1) == {"trades": []}
+        assert len(calls) == trades_collector.MAX_RETRIES
+
+
+class TestRateLimiter:
+    """Tests for AIMD request pacing."""
+
+    def test_multiplicative_decrease_additive_increase(self):
+        limiter = trades_collector._RateLimiter(max_rate=4.0, min_rate=1.0)
+
+        limiter.on_throttle()
+        limiter.on_throttle()
+        limiter.on_throttle()
+        assert limiter.current_rate == 1.0  # Floored at min_rate
+
+        limiter.on_success()
+        assert limiter.current_rate == 1.0 + trades_collector.RATE_INCREASE
+        for _ in range(20):
+            limiter.on_success()
+        assert limiter.current_rate == 4.0  # Capped at max_rate
+
+    def test_retry_after_defers_next_request(self, monkeypatch):
+        sleeps: list[float] = []
+        monkeypatch.setattr(trades_collector.time, "sleep", sleeps.append)
+        limiter = trades_collector._RateLimiter(max_rate=4.0, min_rate=1.0)
+
+        limiter.on_throttle(retry_after=2.0)
+        limiter.wait()
+
+        assert len(sleeps) == 1 and 1.9 < sleeps[0] <= 2.0
+
+    @pytest.mark.parametrize(
+        ("header", "expected"), [("3", 3.0), ("-1", 0.0), (None, None), ("Wed, 21 Oct", None)]
+    )
+    def test_parse_retry_after(self, header, expected):
+        assert trades_collector._parse_retry_after(header) == expected
+
+
+class TestInsertTrades:
+    """Tests for ClickHouse insert paths (fake client)."""
+
+    @pytest.fixture
+    def fake_client(self, monkeypatch):
+        calls: list[tuple[str, object, dict | None]] = []
+
+        class _FakeClient:
+            def insert_df(self, table, df, settings=None):
+                calls.append((table, df, settings))
+
+            def insert_arrow(self, table, arrow_table, settings=None):
+                calls.append((table, arrow_table, settings))
+
+        monkeypatch.setattr(trades_collector, "get_client", lambda: _FakeClient())
+        return calls
+
+    def test_inserts_are_columnar(self, fake_client, trade_factory, monkeypatch):
+        import pandas as pd
+
+        monkeypatch.setattr(trades_collector, "pa", None)  # insert_df fallback
+
+        df = pd.DataFrame([trade_factory(trade_id="1"), trade_factory(trade_id="2")])
+
+        trades_collector._insert_trades(df)
+        trades_collector._insert_trades_with_dedup(df, "BTC", 1)
+
+        assert [(table, obj is df) for table, obj, _ in fake_client] == [
+            ("deribit.options_trades", True),
+            ("deribit.options_trades", True),
+        ]
+        assert fake_client[0][2] is None
+        assert "insert_deduplication_token" in fake_client[1][2]
+
+    def test_dedup_insert_sends_arrow_table(self, fake_client, trade_factory):
+        pa = pytest.importorskip("pyarrow")
+        df = trades_collector._trades_to_frame([trade_factory(trade_id="1")])
+
+        trades_collector._insert_trades_with_dedup(df, "BTC", 1)
+
+        [(table, arrow_table, settings)] = fake_client
+        assert table == "deribit.options_trades"
+        assert isinstance(arrow_table, pa.Table)
+        assert arrow_table.column_names == list(df.columns)
+        assert settings["async_insert"] == 0
+
+    def test_empty_frame_skips_insert(self, fake_client):
+        import pandas as pd
+
+        trades_collector._insert_trades(pd.DataFrame())
+        assert fake_client == []
+
+
+class TestDeduplicationToken:
+    """Tests for insert deduplication tokens."""
+
+    def test_token_is_stable_and_content_specific(self, trade_factory):
+        df = trades_collector._trades_to_frame(
+            [trade_factory(trade_id=str(ts), timestamp=ts) for ts in (3, 2, 1)]
+        )
+        token = trades_collector._generate_deduplication_token("BTC", df)
+
+        assert len(token) == 32 and int(token, 16) >= 0
+        assert token == trades_collector._generate_deduplication_token("BTC", df.copy())
+        assert token != trades_collector._generate_deduplication_token("ETH", df)
+        assert token != trades_collector._generate_deduplication_token("BTC", df.iloc[:2])
+
+
+class TestTradesToFrame:
+    """Tests for column-wise trade conversion."""
+
+    def test_builds_typed_columns(self, trade_factory):
+        from datetime import date
+
+        trades = [
+            trade_factory(trade_id="1", timestamp=1704067200123),
+            trade_factory(trade_id="2", instrument_name="ETH-28MAR25-5000-P", mark_price=0.1),
+        ]
+
+        df = trades_collector._trades_to_frame(trades)
+
+        assert list(df["trade_id"]) == ["1", "2"]
+        assert str(df["timestamp"].dtype).startswith("datetime64")
+        assert str(df["timestamp"].iloc[0]) == "2024-01-01 00:00:00.123000"  # UTC, not local
+        assert list(df["underlying"]) == ["BTC", "ETH"]
+        assert list(df["option_type"]) == ["C", "P"]
+        assert list(df["strike"]) == [100000.0, 5000.0]
+        assert df["expiry"].iloc[1] == date(2025, 3, 28)
+        assert df["mark_price"].isna().iloc[0] and df["mark_price"].iloc[1] == 0.1
+
+    def test_parses_each_instrument_once(self, monkeypatch, trade_factory):
+        calls: list[str] = []
+        real_parse = trades_collector.parse_instrument
+
+        def counting_parse(name):
+            calls.append(name)
+            return real_parse(name)
+
+        monkeypatch.setattr(trades_collector, "parse_instrument", counting_parse)
+        names = ["BTC-27DEC24-100000-C", "ETH-28MAR25-5000-P"] * 50
+        trades = [trade_factory(trade_id=str(i), instrument_name=n) for i, n in enumerate(names)]
+
+        df = trades_collector._trades_to_frame(trades)
+
+        assert sorted(calls) == sorted(set(names))
+        assert list(df["underlying"]) == [n[:3] for n in names]
+        assert df["strike"].dtype == "float64"
+
+    def test_empty_batch(self):
+        df = trades_collector._trades_to_frame([])
+        assert df.empty and "strike" in df.columns
+
+
+class TestCheckpoint:
+    """Tests for checkpoint persistence."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_save_is_atomic_and_compact(self, tmp_path, monkeypatch, use_orjson):
+        if not use_orjson:
+            monkeypatch.setattr(trades_collector, "orjson", None)
+        path = tmp_path / "nested" / "BTC_0_1.json"
+        trades_collector._save_checkpoint(path, {"last_end_ts": 5, "batch_number": 1})
+        trades_collector._save_checkpoint(path, {"last_end_ts": 3, "batch_number": 2})
+
+        assert path.read_text() == '{"last_end_ts":3,"batch_number":2}'
+        assert trades_collector._load_checkpoint(path) == {"last_end_ts": 3, "batch_number": 2}
+        assert list(path.parent.iterdir()) == [path]  # No temp file left behind